@@ -1,13 +1,200 @@
 # plant_health_analyzer.py - Part 1 (First Half) - FIXED VERSION
 
 import re
+import copy
+import time
+import heapq
 import logging
-from typing import Dict, List, Any
+import datetime
+from collections import OrderedDict
+from typing import Dict, List, Any, Tuple, Union
 from plant_database import PlantDatabase
 
 logger = logging.getLogger(__name__)
 
+# Hand-written symptom patterns layered over the database-derived ones
+SPECIFIC_SYMPTOM_PATTERNS = {
+    # More specific fungal indicators
+    "fungal_infection": r"\b(fungal infection|fungal disease|fungus growing|moldy|mold growth)\b",
+    "fungal_spots": r"\b(fuzzy spots|circular spots with.*center|brown spots.*fuzzy)\b",
+    
+    # More specific bacterial indicators  
+    "bacterial_infection": r"\b(bacterial infection|bacterial disease|water-soaked|oozing|bacterial ooze)\b",
+    "bacterial_spots": r"\b(water.soaked.*spots|dark spots.*yellow halo|shot.hole)\b",
+    
+    # More specific viral indicators
+    "viral_infection": r"\b(viral infection|viral disease|mosaic pattern|mottled leaves)\b",
+    "viral_symptoms": r"\b(mosaic|mottling|stunted.*growth|leaf.*curl.*virus)\b",
+    
+    # More specific insect indicators
+    "insect_damage": r"\b(chewed.*leaves|holes.*eaten|insect.*bite|pest.*damage)\b",
+    "insect_feeding": r"\b(feeding.*damage|eaten.*holes|nibbled|gnawed)\b",
+    
+    # Keep general patterns but make them less aggressive
+    "general_browning": r"\b(brown|browning)\b.*\b(edges?|margins?|tips?)\b",
+    "general_yellowing": r"\b(yellow|yellowing)\b.*\b(leaves?|foliage)\b",
+    "general_spots": r"\b(spots?|lesions?)\b(?!\s*of\s)",  # Exclude "spots of" 
+    "general_wilting": r"\b(wilt|wilting|drooping)\b"
+}
+
+# Phrases that mark an explicitly healthy plant, searched as one alternation
+HEALTHY_INDICATORS = [
+    r"\bhealthy\s+plant\b", r"\bappears\s+healthy\b", r"\blooks\s+healthy\b", 
+    r"\bno\s+signs?\s+of\s+(disease|problems|issues)\b",
+    r"\bno\s+visible\s+(problems|disease|damage)\b",
+    r"\bplant\s+is\s+healthy\b", r"\bgood\s+health\b"
+]
+HEALTHY_INDICATOR_RE = re.compile("|".join(f"(?:{pattern})" for pattern in HEALTHY_INDICATORS))
+
+# Terms that rule out an explicitly healthy diagnosis
+DEFINITIVE_PROBLEMS = [
+    r"\bfungal\s+infection\b", r"\bbacterial\s+infection\b", r"\bviral\s+infection\b", 
+    r"\bdisease\b(?!\s+resistant)", r"\binfection\b", r"\bblight\b", r"\brust\b(?!\s+resistant)",
+    r"\bmildew\b", r"\brot\b(?:ting)?\b", r"\bfungal\b", r"\bbacterial\b", r"\bviral\b"
+]
+DEFINITIVE_PROBLEM_RE = re.compile("|".join(f"(?:{pattern})" for pattern in DEFINITIVE_PROBLEMS))
+
+# Vaguer indicators used when no specific symptom was found
+IMPLICIT_PROBLEMS = [
+    r"\bbrown\b.*\b(edge|tip|spot)\b", r"\byellow\b.*\b(leaf|leave)\b", 
+    r"\bwilt\b", r"\bdamage\b", r"\bstress\b", r"\bproblem\b", r"\bissue\b"
+]
+IMPLICIT_PROBLEM_RE = re.compile("|".join(f"(?:{pattern})" for pattern in IMPLICIT_PROBLEMS))
+
+# Chat-template preamble before the model's answer: up to "Answer:", then up to "assistant"
+ANSWER_PREFIX_RE = re.compile(r'^(?:.*?Answer:\s*)?(?:.*?assistant[:\s]*)?', re.IGNORECASE)
+
+
+class SymptomColumns:
+    """Column view of a detected-symptom list: parallel names, confidences and matched texts"""
+    __slots__ = ("names", "confidences", "text_matches", "keyword_hits")
+    
+    def __init__(self, symptoms: List[Dict]):
+        self.names = [symptom["name"] for symptom in symptoms]
+        self.confidences = [symptom["confidence"] for symptom in symptoms]
+        self.text_matches = [symptom["text_match"] for symptom in symptoms]
+        self.keyword_hits = None  # Filled in by PlantHealthAnalyzer._keyword_hits
+    
+    @classmethod
+    def of(cls, symptoms: Union[List[Dict], "SymptomColumns"]) -> "SymptomColumns":
+        """Return symptoms as columns, converting a list of symptom dicts if needed"""
+        return symptoms if isinstance(symptoms, cls) else cls(symptoms)
+
+
+class ConditionMatch:
+    """Candidate condition for one analysis; as_dict() gives the response form"""
+    __slots__ = ("name", "score", "matched_symptoms", "info", "confidence", "source", "category", "role",
+                 "display_name", "owns_info")
+    
+    def __init__(self, name: str, score: float, matched_symptoms: List[str], info: Dict,
+                 confidence: float, source: str, category: str, role: str = None, owns_info: bool = False):
+        self.name = name
+        self.score = score
+        self.matched_symptoms = matched_symptoms
+        self.info = info
+        self.confidence = confidence
+        self.source = source
+        self.category = category
+        self.role = role
+        self.display_name = name.replace('_', ' ').title()
+        self.owns_info = owns_info  # info built for this match rather than shared with the database
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Response dict for this condition ("role" only once one has been assigned)"""
+        condition = {
+            "name": self.name,
+            "score": self.score,
+            "matched_symptoms": list(self.matched_symptoms),
+            # Matches are reused across requests, so each response gets its own copy of built info
+            "info": copy.deepcopy(self.info) if self.owns_info else self.info,
+            "confidence": self.confidence,
+            "source": self.source,
+            "category": self.category
+        }
+        if self.role is not None:
+            condition["role"] = self.role
+        return condition
+
+
+def _trie_regex(literals) -> str:
+    """Factor literals into a prefix-trie regex that tries longer continuations first"""
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of a literal
+    
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        # Greedy "?" prefers the longer branches and falls back to ending here
+        return "(?:" + "|".join(branches) + (")?" if "" in node else ")")
+    
+    return build(trie)
+
+
+def _is_word_char(char: str) -> bool:
+    """Same test as the regex \\w class for a single character"""
+    return char.isalnum() or char == "_"
+
+
 class PlantHealthAnalyzer:
+    # Treatment urgency levels, lowest first
+    _URGENCY_LEVELS = ("low", "medium", "high", "emergency")
+    _URGENCY_INDEX = {urgency: level for level, urgency in enumerate(_URGENCY_LEVELS)}
+    _URGENCY_ICONS = {"emergency": "🚨", "high": "⚠️", "medium": "⚖️", "low": "📋"}
+    
+    # Short description shown next to each severity level in recommendations
+    _SEVERITY_DESCRIPTIONS = {
+        "critical": "Immediate attention required",
+        "high": "Prompt treatment needed", 
+        "moderate": "Monitor and treat",
+        "mild": "Watch closely",
+        "none": "No immediate concerns"
+    }
+    
+    # Description and category of each generic fallback condition
+    _GENERIC_CONDITIONS = {
+        "infection": ("Possible plant infection requiring treatment", "pathogenic"),
+        "nutrient_deficiency": ("Possible nutrient deficiency affecting plant health", "nutritional"),
+        "environmental_stress": ("Environmental stress affecting plant condition", "environmental"),
+        "general_stress": ("General plant stress condition requiring attention", "other")
+    }
+    _ENVIRONMENTAL_STRESS_SYMPTOMS = frozenset(["browning", "burning", "wilting"])
+    
+    # Immediate actions for a plant that appears healthy
+    _HEALTHY_ACTIONS = (
+        "✅ Great news! Your plant appears healthy",
+        "🔍 Continue regular monitoring for any changes",
+        "💧 Maintain current watering and care routine",
+        "🌱 Keep up the good work with plant care!"
+    )
+    
+    # Compiled patterns and lookup tables shared by instances over the same database contents
+    _database_builds: Dict[tuple, tuple] = {}
+    
+    # Number of parsed analyses kept per analyzer for repeated model output
+    _PARSE_CACHE_SIZE = 256
+    
+    # Number of condition matches kept per analyzer for repeated requests
+    _MATCH_CACHE_SIZE = 128
+    
+    # Words that negate a symptom mentioned right after them
+    _NEGATIVE_INDICATORS = frozenset(['no', 'without', 'absence of', 'not', 'free from', 'clear of'])
+    
+    # Text ending in a negating word followed by at most two more words. Only single words
+    # can equal a whitespace-separated word, so the multi-word indicators never match.
+    _NEGATED_TAIL_RE = re.compile(r"(?:^|\s)(?:%s)(?:\s+\S+){0,2}\s*\Z" % "|".join(
+        sorted((re.escape(word) for word in _NEGATIVE_INDICATORS if " " not in word), key=len, reverse=True)
+    ))
+    
+    # (monotonic hour, season) of the last season lookup
+    _season_cache = (None, "")
+    
     def __init__(self):
         """Initialize plant health analyzer with improved diagnostic logic"""
         self.plant_db = PlantDatabase()
@@ -15,8 +202,32 @@ class PlantHealthAnalyzer:
         # Get all conditions from database for dynamic symptom patterns
         self.all_conditions = self.plant_db.get_all_conditions()
         
-        # Build dynamic symptom patterns from database
-        self.symptom_patterns = self._build_symptom_patterns_from_db()
+        # Build dynamic symptom patterns and per-condition scoring data from database,
+        # reusing an earlier build when the database contents are the same
+        signature = self._database_signature()
+        build = self._database_builds.get(signature)
+        if build is None:
+            self.symptom_patterns = self._build_symptom_patterns_from_db()
+            literal_scanner = self._build_literal_scanner()
+            condition_index = {
+                condition_name: self._index_condition(condition_info)
+                for condition_name, condition_info in self.all_conditions.items()
+            }
+            database_keywords = frozenset(
+                keyword for index in condition_index.values() for keyword in index["keywords"]
+            )
+            condition_prefixes = {
+                pattern_key: self._find_condition_prefixes(pattern_key) for pattern_key in self.symptom_patterns
+            }
+            build = (self.symptom_patterns, literal_scanner, condition_index, database_keywords,
+                     self._index_plant_types(), condition_prefixes)
+            PlantHealthAnalyzer._database_builds[signature] = build
+        
+        (symptom_patterns, literal_scanner, self._condition_index, self._database_keywords,
+         self._plant_type_index, self._condition_prefixes) = build
+        self.symptom_patterns = dict(symptom_patterns)
+        (self._literal_scanner, self._ascii_literal_scanner, self._literal_hits,
+         self._folded_literal_hits, self._regex_symptom_patterns) = literal_scanner
         
         # Severity assessment keywords (enhanced from database)
         self.severity_keywords = {
@@ -26,13 +237,29 @@ class PlantHealthAnalyzer:
             "mild": ["few leaves", "early stage", "beginning", "slight", "minor", "starting"]
         }
         
+        # One alternation per tier, checked from most to least severe
+        self._severity_patterns = [
+            (severity, re.compile("|".join(re.escape(keyword) for keyword in keywords)))
+            for severity, keywords in self.severity_keywords.items() if keywords
+        ]
+        
+        # General and seasonal advice lists from the database, cached per key on first use
+        self._general_advice_cache = {}
+        self._seasonal_advice_cache = {}
+        
+        # Text stage results keyed by cleaned analysis text, least recently used first
+        self._parse_cache = OrderedDict()
+        
+        # Matched conditions keyed by (cleaned analysis, plant context), least recently used first
+        self._match_cache = OrderedDict()
+        
         # Diagnostic exclusion rules - conditions that rarely occur together
         self.exclusion_rules = {
-            "fungal_leaf_spot": ["bacterial_spot", "viral_mosaic"],  # Reduce likelihood of co-occurrence
-            "bacterial_spot": ["fungal_leaf_spot", "viral_mosaic"],
-            "powdery_mildew": ["bacterial_wilt", "root_rot"],
-            "viral_mosaic": ["bacterial_spot", "fungal_leaf_spot"],
-            "insect_damage": [],  # Can co-occur with diseases as secondary issue
+            "fungal_leaf_spot": frozenset(["bacterial_spot", "viral_mosaic"]),  # Reduce likelihood of co-occurrence
+            "bacterial_spot": frozenset(["fungal_leaf_spot", "viral_mosaic"]),
+            "powdery_mildew": frozenset(["bacterial_wilt", "root_rot"]),
+            "viral_mosaic": frozenset(["bacterial_spot", "fungal_leaf_spot"]),
+            "insect_damage": frozenset(),  # Can co-occur with diseases as secondary issue
         }
         
         # Condition categories for better logic
@@ -44,240 +271,436 @@ class PlantHealthAnalyzer:
             "environmental": ["nutrient_deficiency", "water_stress", "light_stress", "heat_stress"],
             "nutritional": ["nitrogen_deficiency", "potassium_deficiency", "iron_deficiency", "magnesium_deficiency"]
         }
-    
-    def _build_symptom_patterns_from_db(self) -> Dict[str, str]:
-        """Build more specific symptom detection patterns from database"""
-        patterns = {}
         
-        # Extract patterns from all database conditions
+        # Confidence multiplier for a (primary category, secondary category) pair
+        self._category_multipliers = {}
+        for primary_category in list(self.condition_categories) + ["other"]:
+            # Same category (e.g., both fungal) - reduce confidence of secondary
+            if primary_category in ("fungal", "bacterial", "viral"):
+                self._category_multipliers[(primary_category, primary_category)] = 0.4
+            # Environmental and nutritional can be secondary to primary diseases
+            for secondary_category in ("environmental", "nutritional"):
+                self._category_multipliers[(primary_category, secondary_category)] = 0.7
+            # Insect damage can be secondary to diseases (stress attracts pests)
+            if primary_category in ("fungal", "bacterial"):
+                self._category_multipliers[(primary_category, "insect")] = 0.6
+        
+        # Reverse lookup: condition name -> first category listing it
+        self._category_of = {}
+        for category, conditions in self.condition_categories.items():
+            for condition_name in conditions:
+                self._category_of.setdefault(condition_name, category)
+    
+    def _database_signature(self) -> tuple:
+        """Hashable summary of the database fields the patterns and scoring tables are built from"""
+        return tuple(
+            (condition_name,
+             tuple(condition_info.get("symptoms", [])),
+             tuple(condition_info.get("keywords", [])),
+             tuple(condition_info.get("common_plants", [])))
+            for condition_name, condition_info in self.all_conditions.items()
+        )
+    
+    def _iter_db_symptom_terms(self):
+        """Yield (pattern key, literal terms) for every database-derived symptom pattern"""
         for condition_name, condition_info in self.all_conditions.items():
-            # Add condition name as pattern
+            # Condition name in both spaced and underscored form
             clean_name = condition_name.replace('_', ' ')
-            patterns[condition_name] = rf"\b({re.escape(clean_name)}|{re.escape(condition_name)})\b"
+            yield condition_name, (clean_name, condition_name)
             
-            # Add symptoms from database with higher specificity
             for symptom in condition_info.get("symptoms", []):
-                symptom_key = f"{condition_name}_{symptom.replace(' ', '_')}"
-                # Make patterns more specific to reduce false matches
-                patterns[symptom_key] = rf"\b{re.escape(symptom)}\b"
+                yield f"{condition_name}_{symptom.replace(' ', '_')}", (symptom,)
             
-            # Add keywords from database
             for keyword in condition_info.get("keywords", []):
-                keyword_key = f"{condition_name}_keyword_{keyword.replace(' ', '_')}"
-                patterns[keyword_key] = rf"\b{re.escape(keyword)}\b"
-        
-        # Add more specific general symptom patterns
-        specific_patterns = {
-            # More specific fungal indicators
-            "fungal_infection": r"\b(fungal infection|fungal disease|fungus growing|moldy|mold growth)\b",
-            "fungal_spots": r"\b(fuzzy spots|circular spots with.*center|brown spots.*fuzzy)\b",
-            
-            # More specific bacterial indicators  
-            "bacterial_infection": r"\b(bacterial infection|bacterial disease|water-soaked|oozing|bacterial ooze)\b",
-            "bacterial_spots": r"\b(water.soaked.*spots|dark spots.*yellow halo|shot.hole)\b",
-            
-            # More specific viral indicators
-            "viral_infection": r"\b(viral infection|viral disease|mosaic pattern|mottled leaves)\b",
-            "viral_symptoms": r"\b(mosaic|mottling|stunted.*growth|leaf.*curl.*virus)\b",
-            
-            # More specific insect indicators
-            "insect_damage": r"\b(chewed.*leaves|holes.*eaten|insect.*bite|pest.*damage)\b",
-            "insect_feeding": r"\b(feeding.*damage|eaten.*holes|nibbled|gnawed)\b",
-            
-            # Keep general patterns but make them less aggressive
-            "general_browning": r"\b(brown|browning)\b.*\b(edges?|margins?|tips?)\b",
-            "general_yellowing": r"\b(yellow|yellowing)\b.*\b(leaves?|foliage)\b",
-            "general_spots": r"\b(spots?|lesions?)\b(?!\s*of\s)",  # Exclude "spots of" 
-            "general_wilting": r"\b(wilt|wilting|drooping)\b"
+                yield f"{condition_name}_keyword_{keyword.replace(' ', '_')}", (keyword,)
+    
+    def _build_symptom_patterns_from_db(self) -> Dict[str, re.Pattern]:
+        """Build more specific symptom detection patterns from database, compiled once"""
+        patterns = {}
+        
+        # Extract patterns from all database conditions
+        for pattern_key, terms in self._iter_db_symptom_terms():
+            if len(terms) > 1:
+                alternatives = "|".join(re.escape(term) for term in terms)
+                patterns[pattern_key] = rf"\b({alternatives})\b"
+            else:
+                # Make patterns more specific to reduce false matches
+                patterns[pattern_key] = rf"\b{re.escape(terms[0])}\b"
+        
+        patterns.update(SPECIFIC_SYMPTOM_PATTERNS)
+        return {key: re.compile(pattern, re.IGNORECASE) for key, pattern in patterns.items()}
+    
+    def _build_literal_scanner(self):
+        """Compile all database literals into one pattern that finds every hit in a single pass"""
+        pattern_order = {key: index for index, key in enumerate(self.symptom_patterns)}
+        
+        # Later duplicates override earlier ones, exactly as in the pattern dict
+        literal_terms = dict(self._iter_db_symptom_terms())
+        literal_keys = {}
+        for pattern_key, terms in literal_terms.items():
+            if pattern_key in SPECIFIC_SYMPTOM_PATTERNS:
+                continue
+            for term in terms:
+                keys = literal_keys.setdefault(term.lower(), [])
+                if pattern_key not in keys:
+                    keys.append(pattern_key)
+        
+        # Each position reports its longest literal that ends on a word boundary
+        literals = sorted(literal_keys, key=len, reverse=True)
+        literal_pattern = rf"(?=\b({_trie_regex(literals)})\b)"
+        scanner = re.compile(literal_pattern, re.IGNORECASE)
+        
+        # On lowercased ASCII text, lowercase ASCII literals need no case folding at all;
+        # IGNORECASE matching is only different for non-ASCII text (e.g. a long s)
+        if all(literal.isascii() for literal in literals):
+            ascii_scanner = re.compile(literal_pattern)
+        else:
+            ascii_scanner = scanner
+        
+        # Shorter literals that also match wherever a longer one does: same start,
+        # and the word boundary after them falls inside the longer literal
+        literal_hits = {}
+        for literal in literals:
+            hit_terms = [literal] + [
+                prefix for prefix in literals
+                if len(prefix) < len(literal) and literal.startswith(prefix)
+                and _is_word_char(prefix[-1]) != _is_word_char(literal[len(prefix)])
+            ]
+            literal_hits[literal] = tuple(
+                (pattern_order[key], len(term), key)
+                for term in hit_terms for key in literal_keys[term]
+            )
+        
+        regex_patterns = tuple(
+            (pattern_order[key], key, self.symptom_patterns[key]) for key in SPECIFIC_SYMPTOM_PATTERNS
+        )
+        # Case-insensitive hits on non-ASCII spellings (e.g. a long s) are looked up by
+        # case-folded text; literals that fold alike keep the first one in scan order
+        folded_literal_hits = {}
+        for literal, hits in literal_hits.items():
+            folded_literal_hits.setdefault(literal.casefold(), hits)
+        
+        return scanner, ascii_scanner, literal_hits, folded_literal_hits, regex_patterns
+    
+    def _index_condition(self, condition_info: Dict) -> Dict[str, Any]:
+        """Precompute the sets and lowercased terms used to score a condition"""
+        keywords = tuple(dict.fromkeys(condition_info.get("keywords", [])))
+        return {
+            "symptoms": frozenset(condition_info.get("symptoms", [])),
+            "keywords": keywords,
+            "keyword_set": frozenset(keywords),
+            "keywords_lower": tuple(keyword.lower() for keyword in keywords),
+            "common_plants_lower": tuple(plant.lower() for plant in condition_info.get("common_plants", []))
         }
+    
+    def _index_plant_types(self) -> Dict[str, tuple]:
+        """Map each plant listed under common_plants to its condition names, in database order"""
+        plant_type_index = {}
+        for condition_name, condition_info in self.all_conditions.items():
+            for plant in condition_info.get("common_plants", []):
+                plant_type_index.setdefault(plant, {})[condition_name] = None
+        return {plant: tuple(condition_names) for plant, condition_names in plant_type_index.items()}
+    
+    def _find_condition_prefixes(self, symptom_name: str) -> tuple:
+        """Database condition names that symptom_name starts with, in database order"""
+        return tuple(
+            condition_name for condition_name in self.all_conditions if symptom_name.startswith(condition_name)
+        )
+    
+    def _get_condition_prefixes(self, symptom_name: str) -> tuple:
+        """Condition names symptom_name starts with, precomputed for every pattern key"""
+        condition_prefixes = self._condition_prefixes.get(symptom_name)
+        if condition_prefixes is None:
+            condition_prefixes = self._find_condition_prefixes(symptom_name)
+        return condition_prefixes
+    
+    def _scan_symptom_patterns(self, analysis_lower: str) -> List[tuple]:
+        """Find all symptom pattern matches as (pattern index, start, end, key) in pattern order"""
+        hits = []
+        last_end = {}
+        
+        # Database literals: one pass over the text for all of them
+        if analysis_lower.isascii():
+            scanner = self._ascii_literal_scanner
+        else:
+            scanner = self._literal_scanner
+        
+        for match in scanner.finditer(analysis_lower):
+            start = match.start()
+            literal_hits = self._literal_hits.get(match.group(1))
+            if literal_hits is None:
+                # Case-insensitive hit on a non-ASCII spelling (e.g. a long s)
+                literal_hits = self._folded_literal_hits[match.group(1).casefold()]
+            for order, length, pattern_key in literal_hits:
+                # finditer never reports overlapping matches of the same pattern
+                if start < last_end.get(pattern_key, 0):
+                    continue
+                last_end[pattern_key] = start + length
+                hits.append((order, start, start + length, pattern_key))
+        
+        # Remaining hand-written regexes. These stay separate: one alternation would only
+        # report the first pattern matching at a position, and the lookahead form that keeps
+        # every pattern's matches is slower than a dozen C-level finditer passes
+        for order, symptom_name, pattern in self._regex_symptom_patterns:
+            try:
+                for match in pattern.finditer(analysis_lower):
+                    hits.append((order, match.start(), match.end(), symptom_name))
+            except Exception as e:
+                logger.warning(f"Error processing symptom pattern {symptom_name}: {e}")
+                continue
         
-        patterns.update(specific_patterns)
-        return patterns
+        hits.sort()
+        return hits
     
     def process_analysis(self, raw_analysis: str, analysis_type: str, plant_context: str) -> Dict[str, Any]:
         """Process analysis with improved diagnostic logic - FIXED VERSION"""
-        try:
-            logger.info(f"Processing {analysis_type} analysis with improved diagnostic logic")
-            logger.info(f"Raw analysis: {raw_analysis}")
-            
-            # Handle empty or error cases
-            if not raw_analysis or len(raw_analysis.strip()) < 10:
-                logger.warning("Raw analysis is too short or empty")
-                return self._create_fallback_response(raw_analysis, analysis_type)
-            
-            # Clean and normalize the analysis text
-            cleaned_analysis = self._clean_analysis_text(raw_analysis)
-            
-            # Extract symptoms from the analysis using database patterns
-            detected_symptoms = self._extract_symptoms_from_db(cleaned_analysis)
-            
-            # Assess initial severity using database information
-            initial_severity = self._assess_severity_with_db(cleaned_analysis, detected_symptoms)
-            
-            # NEW: Improved condition matching with realistic scoring
-            possible_conditions = self._match_conditions_realistically(detected_symptoms, plant_context, cleaned_analysis)
-            
-            # ADJUST SEVERITY BASED ON CONFIDENCE
-            if possible_conditions:
-                primary_confidence = possible_conditions[0].get("confidence", 0.3)
-                severity_level = self._adjust_severity_for_confidence(initial_severity, primary_confidence)
-                logger.info(f"Adjusted severity from {initial_severity} to {severity_level} based on confidence {primary_confidence:.2f}")
-            else:
-                severity_level = initial_severity
-            
-            # Generate treatments with confidence-adjusted urgency
-            treatments = self._generate_treatments_from_db_with_confidence(possible_conditions, severity_level)
-            
-            # Create actionable advice from database
-            immediate_actions = self._generate_immediate_actions_from_db(detected_symptoms, severity_level, possible_conditions)
-            prevention_tips = self._generate_prevention_tips_from_db(possible_conditions)
-            
-            # Calculate overall confidence (fixed version)
-            confidence = self._calculate_overall_confidence(detected_symptoms, possible_conditions)
-            
-            return {
-                "raw_analysis": raw_analysis,
-                "detected_symptoms": detected_symptoms,
-                "severity_level": severity_level,
-                "possible_conditions": possible_conditions,
-                "treatments": treatments,
-                "immediate_actions": immediate_actions,
-                "prevention_tips": prevention_tips,
-                "confidence_score": confidence,
-                "analysis_type": analysis_type,
-                "recommendations": self._format_realistic_recommendations(
-                    possible_conditions, treatments, immediate_actions, severity_level
-                )
-            }
-            
-        except Exception as e:
-            logger.error(f"Error in process_analysis: {e}")
-            return self._create_fallback_response(raw_analysis, analysis_type, str(e))
+        return self.process_analyses_batch([(raw_analysis, analysis_type, plant_context)])[0]
+    
+    def process_analyses_batch(self, items: List[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+        """Process (raw_analysis, analysis_type, plant_context) items; each result matches process_analysis"""
+        # Text stage (cleaning, symptom extraction, initial severity) for the whole batch first,
+        # then condition matching and advice. Items that fail or are too short get a fallback response.
+        staged = []
+        for raw_analysis, analysis_type, plant_context in items:
+            try:
+                logger.info("Processing %s analysis with improved diagnostic logic", analysis_type)
+                logger.info("Raw analysis: %.200s", raw_analysis)  # Truncated: model output can run to several KB
+                
+                # Handle empty or error cases
+                if not raw_analysis or len(raw_analysis.strip()) < 10:
+                    logger.warning("Raw analysis is too short or empty")
+                    staged.append(self._create_fallback_response(raw_analysis, analysis_type))
+                else:
+                    staged.append(self._parse_analysis(raw_analysis))
+            except Exception as e:
+                logger.error(f"Error in process_analysis: {e}")
+                staged.append(self._create_fallback_response(raw_analysis, analysis_type, str(e)))
+        
+        results = []
+        for (raw_analysis, analysis_type, plant_context), stage in zip(items, staged):
+            if isinstance(stage, dict):
+                results.append(stage)
+                continue
+            try:
+                results.append(self._build_analysis_result(raw_analysis, analysis_type, plant_context, stage))
+            except Exception as e:
+                logger.error(f"Error in process_analysis: {e}")
+                results.append(self._create_fallback_response(raw_analysis, analysis_type, str(e)))
+        
+        return results
     
-    def _match_conditions_realistically(self, symptoms: List[Dict], plant_context: str, analysis_text: str) -> List[Dict[str, Any]]:
+    def _parse_analysis(self, raw_analysis: str) -> Tuple[str, str, List[Dict[str, Any]], str]:
+        """Text stage of an analysis: cleaned text, its lowercase form, detected symptoms and initial severity"""
+        # Clean and normalize the analysis text (lowercased once for all matching)
+        cleaned_analysis = self._clean_analysis_text(raw_analysis)
+        
+        # The text stage only depends on the cleaned text, so repeated output reuses it
+        # (pop and re-insert: a separate lookup and move_to_end could race with an eviction)
+        cached = self._parse_cache.pop(cleaned_analysis, None)
+        if cached is not None:
+            self._parse_cache[cleaned_analysis] = cached
+            cleaned_lower, cached_symptoms, initial_severity = cached
+            logger.info("Reusing parsed analysis (%d symptoms)", len(cached_symptoms))
+            return cleaned_analysis, cleaned_lower, [dict(symptom) for symptom in cached_symptoms], initial_severity
+        
+        cleaned_lower = cleaned_analysis.lower()
+        
+        # Extract symptoms from the analysis using database patterns
+        detected_symptoms = self._extract_symptoms_from_db(cleaned_analysis, cleaned_lower)
+        
+        # Assess initial severity using database information
+        initial_severity = self._assess_severity_with_db(cleaned_analysis, detected_symptoms, cleaned_lower)
+        
+        # Cache private copies so callers can modify the returned symptoms
+        self._parse_cache[cleaned_analysis] = (
+            cleaned_lower, tuple(dict(symptom) for symptom in detected_symptoms), initial_severity
+        )
+        if len(self._parse_cache) > self._PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
+        
+        return cleaned_analysis, cleaned_lower, detected_symptoms, initial_severity
+    
+    def _build_analysis_result(self, raw_analysis: str, analysis_type: str, plant_context: str,
+                               parsed: Tuple[str, str, List[Dict[str, Any]], str]) -> Dict[str, Any]:
+        """Match conditions for a parsed analysis and assemble the response"""
+        cleaned_analysis, cleaned_lower, detected_symptoms, initial_severity = parsed
+        
+        # NEW: Improved condition matching with realistic scoring. Matching only depends on the
+        # cleaned text and plant context, so repeated requests (retries, UI refreshes) reuse it;
+        # the advice below is rebuilt per call because prevention tips follow the season
+        match_key = (cleaned_analysis, plant_context)
+        cached_conditions = self._match_cache.pop(match_key, None)
+        if cached_conditions is not None:
+            self._match_cache[match_key] = cached_conditions
+            possible_conditions = list(cached_conditions)
+        else:
+            possible_conditions = self._match_conditions_realistically(detected_symptoms, plant_context, cleaned_analysis, cleaned_lower)
+            self._match_cache[match_key] = tuple(possible_conditions)
+            if len(self._match_cache) > self._MATCH_CACHE_SIZE:
+                self._match_cache.popitem(last=False)
+        
+        # ADJUST SEVERITY BASED ON CONFIDENCE
+        if possible_conditions:
+            primary_confidence = possible_conditions[0].confidence
+            severity_level = self._adjust_severity_for_confidence(initial_severity, primary_confidence)
+            logger.info("Adjusted severity from %s to %s based on confidence %.2f", initial_severity, severity_level, primary_confidence)
+        else:
+            severity_level = initial_severity
+        
+        # Generate treatments with confidence-adjusted urgency
+        treatments = self._generate_treatments_from_db_with_confidence(possible_conditions, severity_level)
+        
+        # Create actionable advice from database
+        immediate_actions = self._generate_immediate_actions_from_db(detected_symptoms, severity_level, possible_conditions)
+        prevention_tips = self._generate_prevention_tips_from_db(possible_conditions)
+        
+        # Calculate overall confidence (fixed version)
+        confidence = self._calculate_overall_confidence(detected_symptoms, possible_conditions)
+        
+        return {
+            "raw_analysis": raw_analysis,
+            "detected_symptoms": detected_symptoms,
+            "severity_level": severity_level,
+            "possible_conditions": [condition.as_dict() for condition in possible_conditions],
+            "treatments": treatments,
+            "immediate_actions": immediate_actions,
+            "prevention_tips": prevention_tips,
+            "confidence_score": confidence,
+            "analysis_type": analysis_type,
+            "recommendations": self._format_realistic_recommendations(
+                possible_conditions, treatments, immediate_actions, severity_level
+            )
+        }
+    
+    def _match_conditions_realistically(self, symptoms: List[Dict], plant_context: str, analysis_text: str,
+                                        analysis_lower: str = None) -> List[ConditionMatch]:
         """NEW: Match conditions with realistic diagnostic logic"""
+        if analysis_lower is None:
+            analysis_lower = analysis_text.lower()
+        
+        # One pass over the symptoms: columnar copy for scoring and matching below
+        columns = SymptomColumns(symptoms)
+        symptom_names = columns.names
         
         # Handle healthy plants first
-        if any(symptom.get("name") == "healthy_plant" for symptom in symptoms):
-            return [{
-                "name": "healthy_plant",
-                "score": 10.0,
-                "matched_symptoms": ["healthy_plant"],
-                "info": {
+        if "healthy_plant" in symptom_names:
+            return [ConditionMatch(
+                name="healthy_plant",
+                score=10.0,
+                matched_symptoms=["healthy_plant"],
+                info={
                     "description": "Plant appears healthy with no visible signs of disease or stress",
                     "treatments": [],
-                    "prevention": self.plant_db.get_general_advice("preventive")
+                    "prevention": list(self._get_general_advice("preventive"))
                 },
-                "confidence": 0.9,
-                "source": "database_healthy",
-                "category": "healthy"
-            }]
+                confidence=0.9,
+                source="database_healthy",
+                category="healthy",
+                owns_info=True
+            )]
         
         # Get initial matches from database
-        symptom_names = [s["name"] for s in symptoms]
         database_matches = self.plant_db.search_by_symptoms(symptom_names)
         
         # Score all conditions
         condition_scores = {}
-        for condition_name, condition_info, base_score in database_matches:
-            enhanced_score = self._calculate_enhanced_condition_score(
-                condition_info, symptoms, plant_context, analysis_text, base_score
-            )
-            
+        enhanced_scores = self._score_conditions(database_matches, columns, plant_context, analysis_lower)
+        for (condition_name, condition_info, _), enhanced_score in zip(database_matches, enhanced_scores):
             if enhanced_score > 0:
                 # Determine condition category
                 category = self._get_condition_category(condition_name)
                 
-                condition_scores[condition_name] = {
-                    "name": condition_name,
-                    "score": enhanced_score,
-                    "matched_symptoms": self._get_matched_symptoms(condition_info, symptoms),
-                    "info": condition_info,
-                    "confidence": min(enhanced_score / 10.0, 1.0),
-                    "source": "database_match",
-                    "category": category
-                }
+                condition_scores[condition_name] = ConditionMatch(
+                    name=condition_name,
+                    score=enhanced_score,
+                    matched_symptoms=self._get_matched_symptoms(condition_info, columns, condition_name),
+                    info=condition_info,
+                    confidence=min(enhanced_score / 10.0, 1.0),
+                    source="database_match",
+                    category=category
+                )
         
         # Apply realistic diagnostic logic
         final_conditions = self._apply_diagnostic_hierarchy(condition_scores, symptoms, analysis_text)
         
         # Add plant-specific conditions if relevant
         if plant_context:
-            plant_specific = self._get_plant_specific_conditions(plant_context, symptoms)
+            plant_specific = self._get_plant_specific_conditions(plant_context, columns)
             final_conditions.extend(plant_specific)
         
         # If no conditions found, create generic ones
         if not final_conditions:
-            final_conditions = self._create_generic_conditions(symptoms, analysis_text)
+            final_conditions = self._create_generic_conditions(columns, analysis_text)
         
-        # Sort by score and return top matches
-        return sorted(final_conditions, key=lambda x: x["score"], reverse=True)[:3]
+        # Return top matches by score (same order as a stable descending sort)
+        return heapq.nlargest(3, final_conditions, key=lambda x: x.score)
     
-    def _apply_diagnostic_hierarchy(self, condition_scores: Dict, symptoms: List[Dict], analysis_text: str) -> List[Dict]:
+    def _apply_diagnostic_hierarchy(self, condition_scores: Dict[str, ConditionMatch], symptoms: List[Dict],
+                                    analysis_text: str) -> List[ConditionMatch]:
         """Apply realistic diagnostic hierarchy and exclusion rules"""
         
         if not condition_scores:
             return []
         
-        # Sort conditions by score
-        sorted_conditions = sorted(condition_scores.values(), key=lambda x: x["score"], reverse=True)
+        # Rank conditions by score in a heap; the loop below usually stops after a few,
+        # so only the conditions it actually visits get popped (ties keep insertion order)
+        ranked = [(-condition.score, order, condition) for order, condition in enumerate(condition_scores.values())]
+        heapq.heapify(ranked)
         
         # Start with the highest scoring condition as primary
-        primary_condition = sorted_conditions[0]
+        primary_condition = heapq.heappop(ranked)[2]
         final_conditions = [primary_condition]
         
-        logger.info(f"Primary diagnosis: {primary_condition['name']} (score: {primary_condition['score']:.1f})")
+        logger.info("Primary diagnosis: %s (score: %.1f)", primary_condition.name, primary_condition.score)
         
         # For remaining conditions, apply exclusion rules and category logic
-        for condition in sorted_conditions[1:]:
-            should_include = True
-            adjusted_confidence = condition["confidence"]
-            
-            # Check exclusion rules with primary condition
-            primary_name = primary_condition["name"]
-            condition_name = condition["name"]
+        primary_name = primary_condition.name
+        primary_category = primary_condition.category
+        excluded_names = self.exclusion_rules.get(primary_name, ())
+        log_info = logger.isEnabledFor(logging.INFO)
+        
+        while ranked:
+            condition = heapq.heappop(ranked)[2]
+            adjusted_confidence = condition.confidence
+            condition_name = condition.name
+            condition_category = condition.category
             
             # Apply exclusion rules - reduce confidence if conditions typically don't co-occur
-            if primary_name in self.exclusion_rules:
-                if condition_name in self.exclusion_rules[primary_name]:
-                    # Reduce confidence significantly for excluded combinations
-                    adjusted_confidence *= 0.3
-                    logger.info(f"Reduced confidence for {condition_name} due to exclusion with {primary_name}")
-            
-            # Category-based logic
-            primary_category = primary_condition["category"]
-            condition_category = condition["category"]
+            if condition_name in excluded_names:
+                # Reduce confidence significantly for excluded combinations
+                adjusted_confidence *= 0.3
+                if log_info:
+                    logger.info("Reduced confidence for %s due to exclusion with %s", condition_name, primary_name)
             
-            # If same category (e.g., both fungal), reduce confidence of secondary
-            if primary_category == condition_category and primary_category in ["fungal", "bacterial", "viral"]:
-                adjusted_confidence *= 0.4
-                logger.info(f"Reduced confidence for {condition_name} - same category as primary")
-            
-            # Environmental and nutritional can co-occur with diseases
-            if condition_category in ["environmental", "nutritional"]:
-                # These can be secondary to primary diseases
-                adjusted_confidence *= 0.7
+            # Category-based logic: at most one category multiplier applies to a pair
+            category_multiplier = self._category_multipliers.get((primary_category, condition_category), 1.0)
+            if category_multiplier != 1.0:
+                adjusted_confidence *= category_multiplier
+                if log_info and primary_category == condition_category:
+                    logger.info("Reduced confidence for %s - same category as primary", condition_name)
             
             # Insect damage can be secondary to diseases (stress attracts pests)
-            if condition_category == "insect" and primary_category in ["fungal", "bacterial"]:
-                adjusted_confidence *= 0.6
-                condition["info"]["description"] += " (possibly secondary to primary condition)"
+            if condition_category == "insect" and primary_category in ("fungal", "bacterial"):
+                # Annotate a copy: the info dict is shared with the database and must not accumulate notes
+                condition.info = dict(condition.info)
+                condition.info["description"] += " (possibly secondary to primary condition)"
+                condition.owns_info = True
             
             # Only include if confidence is still reasonable after adjustments
-            if adjusted_confidence > 0.25:  # Minimum threshold
-                condition["confidence"] = adjusted_confidence
-                condition["score"] = condition["score"] * adjusted_confidence  # Adjust score too
-                
-                # Mark as secondary condition
-                if len(final_conditions) >= 1:
-                    condition["role"] = "secondary"
-                else:
-                    condition["role"] = "primary"
-                
-                final_conditions.append(condition)
-                logger.info(f"Added secondary condition: {condition_name} (adjusted confidence: {adjusted_confidence:.2f})")
-            else:
-                logger.info(f"Excluded {condition_name} - confidence too low after adjustments ({adjusted_confidence:.2f})")
+            if adjusted_confidence <= 0.25:  # Minimum threshold
+                if log_info:
+                    logger.info("Excluded %s - confidence too low after adjustments (%.2f)", condition_name, adjusted_confidence)
+                continue
+            
+            condition.confidence = adjusted_confidence
+            condition.score = condition.score * adjusted_confidence  # Adjust score too
+            
+            # Mark as secondary condition
+            condition.role = "secondary"
+            
+            final_conditions.append(condition)
+            if log_info:
+                logger.info("Added secondary condition: %s (adjusted confidence: %.2f)", condition_name, adjusted_confidence)
             
             # Limit to maximum 3 conditions total
             if len(final_conditions) >= 3:
@@ -313,63 +736,90 @@ class PlantHealthAnalyzer:
     
     def _get_condition_category(self, condition_name: str) -> str:
         """Determine the category of a condition"""
-        for category, conditions in self.condition_categories.items():
-            if condition_name in conditions:
-                return category
-        return "other"
+        return self._category_of.get(condition_name, "other")
     
-    def _calculate_enhanced_condition_score(self, condition_info: Dict, symptoms: List[Dict], 
-                                         plant_context: str, analysis_text: str, base_score: float) -> float:
-        """Calculate enhanced condition score with better specificity"""
-        score = base_score
-        
-        # Symptom matching with better weighting
-        condition_symptoms = set(condition_info.get("symptoms", []))
-        condition_keywords = set(condition_info.get("keywords", []))
+    def _calculate_enhanced_condition_score(self, condition_name: str, condition_info: Dict, symptoms: List[Dict], 
+                                         plant_context: str, analysis_lower: str, base_score: float) -> float:
+        """Calculate enhanced condition score with better specificity (expects lowercased analysis text)"""
+        return self._score_conditions(
+            [(condition_name, condition_info, base_score)], symptoms, plant_context, analysis_lower
+        )[0]
+    
+    def _score_conditions(self, candidates: List[tuple], symptoms: Union[List[Dict], SymptomColumns],
+                          plant_context: str, analysis_lower: str) -> List[float]:
+        """Score (name, info, base_score) candidates in one batch, sharing keyword tests between them"""
+        indexes = []
+        for condition_name, condition_info, _ in candidates:
+            index = self._condition_index.get(condition_name)
+            indexes.append(index if index is not None else self._index_condition(condition_info))
+        
+        # Test every keyword once per distinct matched text and once against the analysis,
+        # rather than once per condition that lists it
+        extra_keywords = set()
+        all_keywords_lower = set()
+        for index in indexes:
+            if not index["keyword_set"] <= self._database_keywords:
+                extra_keywords.update(index["keyword_set"] - self._database_keywords)
+            all_keywords_lower.update(index["keywords_lower"])
+        
+        columns = SymptomColumns.of(symptoms)
+        keyword_hits = self._keyword_hits(columns)
+        if extra_keywords:
+            keyword_hits = [
+                hits | {keyword for keyword in extra_keywords if keyword in text_match}
+                for hits, text_match in zip(keyword_hits, columns.text_matches)
+            ]
+        symptom_rows = list(zip(columns.names, columns.confidences, keyword_hits))
         
-        specific_matches = 0
-        general_matches = 0
+        keywords_in_analysis = {keyword for keyword in all_keywords_lower if keyword in analysis_lower}
+        plant_context_lower = plant_context.lower() if plant_context else ""
         
-        for symptom in symptoms:
-            symptom_name = symptom["name"]
-            symptom_confidence = symptom["confidence"]
+        scores = []
+        for (_, _, base_score), index in zip(candidates, indexes):
+            score = base_score
+            condition_symptoms = index["symptoms"]
+            condition_keywords = index["keyword_set"]
             
-            # Check for specific symptom matches (higher weight)
-            if symptom_name in condition_symptoms:
-                score += symptom_confidence * 4  # Higher weight for specific matches
-                specific_matches += 1
+            specific_matches = 0
+            general_matches = 0
             
-            # Check for keyword matches (lower weight)
-            for keyword in condition_keywords:
-                if keyword in symptom["text_match"]:
-                    score += symptom_confidence * 1.5  # Lower weight for keyword matches
-                    general_matches += 1
-        
-        # Bonus for specific matches, penalty for only general matches
-        if specific_matches > 0:
-            score += specific_matches * 2  # Bonus for specific diagnostic features
-        elif general_matches > 0:
-            score *= 0.7  # Reduce score if only general symptoms
-        
-        # Plant context bonus (smaller impact)
-        if plant_context:
-            common_plants = condition_info.get("common_plants", [])
-            for plant in common_plants:
-                if plant.lower() in plant_context.lower():
-                    score += 1
-        
-        # Analysis text keyword matching (reduced impact)
-        analysis_lower = analysis_text.lower()
-        keyword_matches = 0
-        for keyword in condition_keywords:
-            if keyword.lower() in analysis_lower:
-                keyword_matches += 1
-        
-        # Diminishing returns for keyword matches
-        if keyword_matches > 0:
-            score += min(keyword_matches * 0.5, 2.0)  # Cap keyword bonus
-        
-        return max(score, 0)  # Ensure non-negative
+            for symptom_name, symptom_confidence, hits in symptom_rows:
+                # Check for specific symptom matches (higher weight)
+                if symptom_name in condition_symptoms:
+                    score += symptom_confidence * 4  # Higher weight for specific matches
+                    specific_matches += 1
+                
+                # Check for keyword matches (lower weight)
+                if hits:
+                    for _ in range(len(condition_keywords & hits)):
+                        score += symptom_confidence * 1.5  # Lower weight for keyword matches
+                        general_matches += 1
+            
+            # Bonus for specific matches, penalty for only general matches
+            if specific_matches > 0:
+                score += specific_matches * 2  # Bonus for specific diagnostic features
+            elif general_matches > 0:
+                score *= 0.7  # Reduce score if only general symptoms
+            
+            # Plant context bonus (smaller impact)
+            if plant_context_lower:
+                for plant in index["common_plants_lower"]:
+                    if plant in plant_context_lower:
+                        score += 1
+            
+            # Analysis text keyword matching (reduced impact)
+            keyword_matches = 0
+            for keyword in index["keywords_lower"]:
+                if keyword in keywords_in_analysis:
+                    keyword_matches += 1
+            
+            # Diminishing returns for keyword matches
+            if keyword_matches > 0:
+                score += min(keyword_matches * 0.5, 2.0)  # Cap keyword bonus
+            
+            scores.append(max(score, 0))  # Ensure non-negative
+        
+        return scores
     
     def _determine_treatment_urgency(self, treatment: Dict, severity: str, confidence: float = 0.7) -> str:
         """FIXED: Determine treatment urgency based on type, severity, AND confidence"""
@@ -383,28 +833,27 @@ class PlantHealthAnalyzer:
             confidence_modifier = 0.75  # Somewhat lower urgency
         
         # Base urgency
-        if treatment_type in ["emergency", "removal"] or severity == "critical":
+        if treatment_type in {"emergency", "removal"} or severity == "critical":
             base_urgency = "emergency"
-        elif treatment_type in ["fungicide", "bactericide", "antibiotic"] or severity == "high":
+        elif treatment_type in {"fungicide", "bactericide", "antibiotic"} or severity == "high":
             base_urgency = "high"
-        elif treatment_type in ["cultural", "organic", "fertilizer"] or severity == "moderate":
+        elif treatment_type in {"cultural", "organic", "fertilizer"} or severity == "moderate":
             base_urgency = "medium"
         else:
             base_urgency = "low"
         
         # Apply confidence modifier
-        urgency_levels = ["low", "medium", "high", "emergency"]
-        current_level = urgency_levels.index(base_urgency)
+        current_level = self._URGENCY_INDEX[base_urgency]
         
         # Reduce urgency based on confidence
         if confidence_modifier < 1.0:
             reduction = int((1.0 - confidence_modifier) * 2)  # Reduce by 1-2 levels
             new_level = max(0, current_level - reduction)
-            return urgency_levels[new_level]
+            return self._URGENCY_LEVELS[new_level]
         
         return base_urgency
     
-    def _calculate_overall_confidence(self, symptoms: List[Dict], conditions: List[Dict]) -> str:
+    def _calculate_overall_confidence(self, symptoms: List[Dict], conditions: List[ConditionMatch]) -> str:
         """Calculate overall confidence - FIXED VERSION"""
         try:
             if not symptoms or not conditions:
@@ -412,7 +861,7 @@ class PlantHealthAnalyzer:
             
             # Get primary condition confidence
             primary_condition = conditions[0]
-            primary_confidence = primary_condition.get("confidence", 0.3)
+            primary_confidence = primary_condition.confidence
             
             # Convert to descriptive confidence based on actual numbers
             if primary_confidence > 0.7:
@@ -427,18 +876,18 @@ class PlantHealthAnalyzer:
         except Exception:
             return "low"
     
-    def _generate_treatments_from_db_with_confidence(self, conditions: List[Dict], severity: str) -> List[Dict[str, Any]]:
+    def _generate_treatments_from_db_with_confidence(self, conditions: List[ConditionMatch], severity: str) -> List[Dict[str, Any]]:
         """Generate treatments considering both severity and confidence"""
         treatments = []
         
         try:
-            primary_confidence = conditions[0].get("confidence", 0.3) if conditions else 0.3
+            primary_confidence = conditions[0].confidence if conditions else 0.3
             
             # Only use primary condition for low confidence diagnoses
             conditions_to_process = conditions[:1] if primary_confidence < 0.5 else conditions[:2]
             
             for condition in conditions_to_process:
-                condition_info = condition.get("info", {})
+                condition_info = condition.info
                 condition_treatments = condition_info.get("treatments", [])
                 
                 for treatment in condition_treatments:
@@ -466,7 +915,7 @@ class PlantHealthAnalyzer:
                         "details": treatment.get("details", []),
                         "products": treatment.get("products", []),
                         "urgency": urgency,
-                        "condition": condition["name"],
+                        "condition": condition.name,
                         "source": "database"
                     })
             
@@ -487,11 +936,11 @@ class PlantHealthAnalyzer:
             
             # Add general care if no specific treatments
             if not treatments:
-                general_advice = self.plant_db.get_general_advice("moderate")
+                general_advice = self._get_general_advice("moderate")
                 treatments.append({
                     "type": "general_care",
                     "action": "Provide general plant care while monitoring",
-                    "details": general_advice[:3],
+                    "details": list(general_advice[:3]),
                     "urgency": "medium",
                     "source": "database_general"
                 })
@@ -508,7 +957,7 @@ class PlantHealthAnalyzer:
         
         return treatments
     
-    def _format_realistic_recommendations(self, conditions: List[Dict], treatments: List[Dict], 
+    def _format_realistic_recommendations(self, conditions: List[ConditionMatch], treatments: List[Dict], 
                                         actions: List[str], severity: str) -> str:
         """Format recommendations with realistic diagnostic confidence"""
         try:
@@ -517,9 +966,9 @@ class PlantHealthAnalyzer:
             # Primary diagnosis
             if conditions:
                 primary_condition = conditions[0]
-                condition_name = primary_condition['name'].replace('_', ' ').title()
-                confidence = primary_condition.get('confidence', 0.5)
-                role = primary_condition.get('role', 'primary')
+                condition_name = primary_condition.display_name
+                confidence = primary_condition.confidence
+                role = primary_condition.role or 'primary'
                 
                 recommendations.append(f"**Primary Diagnosis**: {condition_name}")
                 recommendations.append(f"**Confidence**: {confidence:.0%}")
@@ -528,27 +977,21 @@ class PlantHealthAnalyzer:
                 if len(conditions) > 1:
                     secondary_conditions = []
                     for condition in conditions[1:]:
-                        sec_name = condition['name'].replace('_', ' ').title()
-                        sec_confidence = condition.get('confidence', 0.3)
+                        sec_name = condition.display_name
+                        sec_confidence = condition.confidence
                         secondary_conditions.append(f"{sec_name} ({sec_confidence:.0%})")
                     
                     recommendations.append(f"**Secondary Concerns**: {', '.join(secondary_conditions)}")
                 
                 # Recovery time if available
-                condition_info = primary_condition.get("info", {})
+                condition_info = primary_condition.info
                 recovery_time = condition_info.get("recovery_time", {})
                 if recovery_time and severity in recovery_time:
                     recommendations.append(f"**Expected Recovery**: {recovery_time[severity]}")
             
             # Severity with realistic assessment
-            severity_desc = {
-                "critical": "Immediate attention required",
-                "high": "Prompt treatment needed", 
-                "moderate": "Monitor and treat",
-                "mild": "Watch closely",
-                "none": "No immediate concerns"
-            }
-            recommendations.append(f"**Severity**: {severity.title()} - {severity_desc.get(severity, 'Assessment needed')}")
+            severity_desc = self._SEVERITY_DESCRIPTIONS.get(severity, 'Assessment needed')
+            recommendations.append(f"**Severity**: {severity.title()} - {severity_desc}")
             
             # Key treatments from primary diagnosis
             if treatments:
@@ -556,7 +999,7 @@ class PlantHealthAnalyzer:
                 for treatment in treatments[:2]:  # Top 2 treatments
                     action = treatment.get('action', 'No action specified')
                     urgency = treatment.get('urgency', 'medium')
-                    urgency_icon = {"emergency": "🚨", "high": "⚠️", "medium": "⚖️", "low": "📋"}.get(urgency, "📋")
+                    urgency_icon = self._URGENCY_ICONS.get(urgency, "📋")
                     recommendations.append(f"• {urgency_icon} {action}")
             
             # Immediate actions (top 3)
@@ -571,26 +1014,18 @@ class PlantHealthAnalyzer:
             logger.error(f"Error formatting recommendations: {e}")
             return f"**Analysis Type**: {severity}\n**Status**: Analysis completed\n**Recommendation**: Follow care instructions and monitor plant condition"
     
-    def _extract_symptoms_from_db(self, analysis: str) -> List[Dict[str, Any]]:
+    def _extract_symptoms_from_db(self, analysis: str, analysis_lower: str = None) -> List[Dict[str, Any]]:
         """Extract symptoms using database-driven patterns"""
-        symptoms = []
-        
         if not analysis or len(analysis.strip()) < 5:
             logger.warning("Analysis text too short for symptom extraction")
-            return symptoms
-            
-        analysis_lower = analysis.lower()
-        logger.info(f"Analyzing text for symptoms using database patterns")
+            return []
         
-        # Check for healthy indicators first
-        healthy_indicators = [
-            r"\bhealthy\s+plant\b", r"\bappears\s+healthy\b", r"\blooks\s+healthy\b", 
-            r"\bno\s+signs?\s+of\s+(disease|problems|issues)\b",
-            r"\bno\s+visible\s+(problems|disease|damage)\b",
-            r"\bplant\s+is\s+healthy\b", r"\bgood\s+health\b"
-        ]
+        if analysis_lower is None:
+            analysis_lower = analysis.lower()
+        logger.info("Analyzing text for symptoms using database patterns")
         
-        has_explicit_healthy = any(re.search(pattern, analysis_lower) for pattern in healthy_indicators)
+        # Check for healthy indicators first
+        has_explicit_healthy = bool(HEALTHY_INDICATOR_RE.search(analysis_lower))
         
         if has_explicit_healthy and not self._has_definitive_problems(analysis_lower):
             logger.info("Plant identified as explicitly healthy")
@@ -602,33 +1037,30 @@ class PlantHealthAnalyzer:
             }]
         
         # Extract symptoms using database patterns
-        for symptom_name, pattern in self.symptom_patterns.items():
-            try:
-                matches = list(re.finditer(pattern, analysis_lower, re.IGNORECASE))
-                for match in matches:
-                    match_text = match.group()
-                    
-                    # Skip if in negative context
-                    surrounding_text = analysis_lower[max(0, match.start()-30):match.end()+30]
-                    if self._is_negative_context(surrounding_text, match_text):
-                        continue
-                    
-                    confidence = self._calculate_symptom_confidence_with_db(match_text, symptom_name, analysis_lower)
-                    
-                    symptoms.append({
-                        "name": symptom_name,
-                        "text_match": match_text,
-                        "confidence": confidence,
-                        "source": "database_pattern"
-                    })
-                    
-                    logger.info(f"Found symptom: {symptom_name} - '{match_text}' (confidence: {confidence})")
-            except Exception as e:
-                logger.warning(f"Error processing symptom pattern {symptom_name}: {e}")
+        best_symptoms = {}  # Highest-confidence match per symptom name, in first-seen order
+        for _, start, end, symptom_name in self._scan_symptom_patterns(analysis_lower):
+            match_text = analysis_lower[start:end]
+            
+            # Skip if in negative context
+            surrounding_text = analysis_lower[max(0, start-30):end+30]
+            if self._is_negative_context(surrounding_text, match_text):
                 continue
+            
+            confidence = self._calculate_symptom_confidence_with_db(match_text, symptom_name, analysis_lower)
+            
+            current = best_symptoms.get(symptom_name)
+            if current is None or confidence > current["confidence"]:
+                best_symptoms[symptom_name] = {
+                    "name": symptom_name,
+                    "text_match": match_text,
+                    "confidence": confidence,
+                    "source": "database_pattern"
+                }
+            
+            logger.info("Found symptom: %s - '%s' (confidence: %s)", symptom_name, match_text, confidence)
         
-        # Remove duplicates and sort by confidence
-        unique_symptoms = self._deduplicate_symptoms(symptoms)
+        # Duplicates were merged above; sorted by confidence below
+        unique_symptoms = list(best_symptoms.values())
         
         # If no symptoms found, create default response
         if not unique_symptoms and len(analysis.strip()) > 10:
@@ -678,11 +1110,11 @@ class PlantHealthAnalyzer:
             
             # Add general care if no specific treatments
             if not treatments:
-                general_advice = self.plant_db.get_general_advice("moderate")
+                general_advice = self._get_general_advice("moderate")
                 treatments.append({
                     "type": "general_care",
                     "action": "Provide general plant care",
-                    "details": general_advice[:3],
+                    "details": list(general_advice[:3]),
                     "urgency": "medium",
                     "source": "database_general"
                 })
@@ -704,36 +1136,31 @@ class PlantHealthAnalyzer:
         treatment_type = treatment.get("type", "general")
         
         # Emergency treatments
-        if treatment_type in ["emergency", "removal"] or severity == "critical":
+        if treatment_type in {"emergency", "removal"} or severity == "critical":
             return "emergency"
         
         # High urgency treatments
-        if treatment_type in ["fungicide", "bactericide", "antibiotic"] or severity == "high":
+        if treatment_type in {"fungicide", "bactericide", "antibiotic"} or severity == "high":
             return "high"
         
         # Medium urgency treatments
-        if treatment_type in ["cultural", "organic", "fertilizer"] or severity == "moderate":
+        if treatment_type in {"cultural", "organic", "fertilizer"} or severity == "moderate":
             return "medium"
         
         # Low urgency treatments
         return "low"
     
-    def _generate_immediate_actions_from_db(self, symptoms: List[Dict], severity: str, conditions: List[Dict]) -> List[str]:
+    def _generate_immediate_actions_from_db(self, symptoms: List[Dict], severity: str, conditions: List[ConditionMatch]) -> List[str]:
         """Generate immediate actions using database information - UPDATED for confidence"""
         actions = []
         
         try:
             # Handle healthy plants
             if severity == "none" or any(symptom.get("name") == "healthy_plant" for symptom in symptoms):
-                return [
-                    "✅ Great news! Your plant appears healthy",
-                    "🔍 Continue regular monitoring for any changes",
-                    "💧 Maintain current watering and care routine",
-                    "🌱 Keep up the good work with plant care!"
-                ]
+                return list(self._HEALTHY_ACTIONS)
             
             # Get confidence level for action modification
-            primary_confidence = conditions[0].get("confidence", 0.3) if conditions else 0.3
+            primary_confidence = conditions[0].confidence if conditions else 0.3
             
             # Adjust actions based on confidence
             if primary_confidence < 0.4:
@@ -753,41 +1180,34 @@ class PlantHealthAnalyzer:
                 ]
             else:
                 # Good confidence - normal severity-based actions
-                severity_advice = self.plant_db.get_general_advice(severity)
+                severity_advice = self._get_general_advice(severity)
                 if severity_advice:
                     actions.extend(severity_advice[:2])
                 
                 # Add emergency actions if needed and confidence is sufficient
-                if severity in ["critical", "high"]:
-                    emergency_advice = self.plant_db.get_general_advice("emergency")
+                if severity in {"critical", "high"}:
+                    emergency_advice = self._get_general_advice("emergency")
                     actions.extend(emergency_advice[:1])
                 
                 # Add condition-specific immediate actions (only primary condition)
                 if conditions:
                     primary_condition = conditions[0]
-                    condition_info = primary_condition.get("info", {})
+                    condition_info = primary_condition.info
                     treatments = condition_info.get("treatments", [])
                     
                     # Find high-urgency treatments
                     for treatment in treatments[:1]:
-                        if treatment.get("type") in ["emergency", "removal", "pruning"]:
-                            action_text = f"🚨 {treatment.get('action', 'Take immediate action')}"
-                            if action_text not in actions:
-                                actions.append(action_text)
+                        if treatment.get("type") in {"emergency", "removal", "pruning"}:
+                            actions.append(f"🚨 {treatment.get('action', 'Take immediate action')}")
             
-            # Always add monitoring
-            if "📋 Take photos to monitor progress" not in actions:
-                actions.append("📋 Take photos to monitor progress over next few days")
+            # Remove duplicates while preserving order (dict keys keep the first occurrence)
+            unique_actions = dict.fromkeys(actions)
             
-            # Remove duplicates while preserving order
-            seen = set()
-            unique_actions = []
-            for action in actions:
-                if action not in seen:
-                    seen.add(action)
-                    unique_actions.append(action)
+            # Always add monitoring
+            if "📋 Take photos to monitor progress" not in unique_actions:
+                unique_actions["📋 Take photos to monitor progress over next few days"] = None
             
-            return unique_actions[:4]  # Limit to 4 actions
+            return list(unique_actions)[:4]  # Limit to 4 actions
             
         except Exception as e:
             logger.error(f"Error generating immediate actions from database: {e}")
@@ -797,39 +1217,39 @@ class PlantHealthAnalyzer:
                 "📱 Consult plant expert if needed"
             ]
     
-    def _generate_prevention_tips_from_db(self, conditions: List[Dict]) -> List[str]:
+    def _generate_prevention_tips_from_db(self, conditions: List[ConditionMatch]) -> List[str]:
         """Generate prevention tips using database information"""
-        tips = set()
+        tips = {}  # Dict keys: duplicates dropped, first-seen order kept
         
         try:
             # Get prevention tips from matched conditions (only primary)
             if conditions:
                 primary_condition = conditions[0]
-                condition_info = primary_condition.get("info", {})
+                condition_info = primary_condition.info
                 condition_prevention = condition_info.get("prevention", [])
-                tips.update(condition_prevention[:3])  # Reduced from all to 3
+                tips.update(dict.fromkeys(condition_prevention[:3]))  # Reduced from all to 3
             
             # Add general preventive advice from database
-            general_prevention = self.plant_db.get_general_advice("preventive")
-            tips.update(general_prevention[:3])  # Reduced from 5 to 3
+            general_prevention = self._get_general_advice("preventive")
+            tips.update(dict.fromkeys(general_prevention[:3]))  # Reduced from 5 to 3
             
             # Add seasonal advice if available
-            import datetime
             current_season = self._get_current_season()
-            seasonal_advice = self.plant_db.get_seasonal_advice(current_season)
-            tips.update(seasonal_advice[:2])  # Reduced from 3 to 2
+            seasonal_advice = self._get_seasonal_advice(current_season)
+            tips.update(dict.fromkeys(seasonal_advice[:2]))  # Reduced from 3 to 2
             
         except Exception as e:
             logger.error(f"Error generating prevention tips from database: {e}")
-            tips = {
+            tips = dict.fromkeys([
                 "🔍 Regular plant inspection",
                 "💧 Proper watering practices", 
                 "🌱 Good plant nutrition"
-            }
+            ])
         
         return list(tips)[:6]  # Reduced from 8 to 6 tips
     
-    def _get_plant_specific_conditions(self, plant_context: str, symptoms: List[Dict]) -> List[Dict]:
+    def _get_plant_specific_conditions(self, plant_context: str,
+                                       symptoms: Union[List[Dict], SymptomColumns]) -> List[ConditionMatch]:
         """Get conditions specific to mentioned plants"""
         conditions = []
         
@@ -837,91 +1257,97 @@ class PlantHealthAnalyzer:
         plant_words = plant_context.lower().split()
         
         for plant_word in plant_words:
-            plant_conditions = self.plant_db.search_by_plant_type(plant_word)
+            # Same matches as plant_db.search_by_plant_type, from the prebuilt index
+            plant_conditions = self._plant_type_index.get(plant_word, ())
             
-            for condition_name, condition_info in plant_conditions:
+            for condition_name in plant_conditions:
+                condition_info = self.all_conditions[condition_name]
+                
                 # Score based on symptom matches
-                score = self._calculate_enhanced_condition_score(condition_info, symptoms, plant_context, "", 1.0)
+                score = self._calculate_enhanced_condition_score(condition_name, condition_info, symptoms, plant_context, "", 1.0)
                 
                 if score > 0:
-                    conditions.append({
-                        "name": condition_name,
-                        "score": score + 1,  # Bonus for plant-specific
-                        "matched_symptoms": self._get_matched_symptoms(condition_info, symptoms),
-                        "info": condition_info,
-                        "confidence": min(score / 8.0, 1.0),
-                        "source": f"plant_specific_{plant_word}",
-                        "category": self._get_condition_category(condition_name)
-                    })
+                    conditions.append(ConditionMatch(
+                        name=condition_name,
+                        score=score + 1,  # Bonus for plant-specific
+                        matched_symptoms=self._get_matched_symptoms(condition_info, symptoms, condition_name),
+                        info=condition_info,
+                        confidence=min(score / 8.0, 1.0),
+                        source=f"plant_specific_{plant_word}",
+                        category=self._get_condition_category(condition_name)
+                    ))
         
         return conditions
     
-    def _create_generic_conditions(self, symptoms: List[Dict], analysis_text: str) -> List[Dict]:
+    def _create_generic_conditions(self, symptoms: Union[List[Dict], SymptomColumns],
+                                   analysis_text: str) -> List[ConditionMatch]:
         """Create generic conditions when no database matches found"""
         conditions = []
         
-        symptom_names = [s["name"] for s in symptoms]
+        symptom_names = list(SymptomColumns.of(symptoms).names)
         
-        # Determine generic condition type
-        if any("infection" in name for name in symptom_names):
+        # Determine generic condition type (one substring test over all names per keyword)
+        joined_names = "\n".join(symptom_names)
+        if "infection" in joined_names:
             condition_type = "infection"
-            description = "Possible plant infection requiring treatment"
-            category = "pathogenic"
-        elif any("deficiency" in name for name in symptom_names):
+        elif "deficiency" in joined_names:
             condition_type = "nutrient_deficiency"
-            description = "Possible nutrient deficiency affecting plant health"
-            category = "nutritional"
-        elif any(name in ["browning", "burning", "wilting"] for name in symptom_names):
+        elif not self._ENVIRONMENTAL_STRESS_SYMPTOMS.isdisjoint(symptom_names):
             condition_type = "environmental_stress"
-            description = "Environmental stress affecting plant condition"
-            category = "environmental"
         else:
             condition_type = "general_stress"
-            description = "General plant stress condition requiring attention"
-            category = "other"
+        description, category = self._GENERIC_CONDITIONS[condition_type]
         
         # Get appropriate general advice from database
-        general_advice = self.plant_db.get_general_advice("moderate")
+        general_advice = self._get_general_advice("moderate")
         
-        conditions.append({
-            "name": condition_type,
-            "score": 5.0,
-            "matched_symptoms": symptom_names,
-            "info": {
+        conditions.append(ConditionMatch(
+            name=condition_type,
+            score=5.0,
+            matched_symptoms=symptom_names,
+            info={
                 "description": description,
                 "treatments": [
-                    {"type": "general", "action": "Monitor and adjust care", "details": general_advice[:3], "urgency": "medium"}
+                    {"type": "general", "action": "Monitor and adjust care", "details": list(general_advice[:3]), "urgency": "medium"}
                 ],
-                "prevention": self.plant_db.get_general_advice("preventive")[:5]
+                "prevention": list(self._get_general_advice("preventive")[:5])
             },
-            "confidence": 0.4,
-            "source": "generic_fallback",
-            "category": category
-        })
+            confidence=0.4,
+            source="generic_fallback",
+            category=category,
+            owns_info=True
+        ))
         
         return conditions
     
     # Helper methods
     def _get_current_season(self) -> str:
-        """Get current season for seasonal advice"""
-        import datetime
+        """Get current season for seasonal advice (looked up at most once an hour)"""
+        hour = int(time.monotonic() // 3600)
+        cached_hour, season = PlantHealthAnalyzer._season_cache
+        if cached_hour == hour:
+            return season
+        
         month = datetime.datetime.now().month
         if month in [12, 1, 2]:
-            return "winter"
+            season = "winter"
         elif month in [3, 4, 5]:
-            return "spring"
+            season = "spring"
         elif month in [6, 7, 8]:
-            return "summer"
+            season = "summer"
         else:
-            return "fall"
+            season = "fall"
+        
+        PlantHealthAnalyzer._season_cache = (hour, season)
+        return season
     
     def _create_fallback_response(self, raw_analysis: str, analysis_type: str, error_msg: str = None) -> Dict[str, Any]:
         """Create fallback response using database general advice"""
         logger.info("Creating fallback response using database")
         
         try:
-            general_advice = self.plant_db.get_general_advice("moderate")
-            preventive_advice = self.plant_db.get_general_advice("preventive")
+            general_advice = list(self._get_general_advice("moderate"))
+            preventive_advice = list(self._get_general_advice("preventive"))
             
             return {
                 "raw_analysis": raw_analysis or "No analysis available",
@@ -962,71 +1388,76 @@ class PlantHealthAnalyzer:
                 "recommendations": "Analysis failed - consult plant expert"
             }
     
+    def _get_general_advice(self, category: str) -> tuple:
+        """General advice for a category, read from the database once and kept as a tuple"""
+        advice = self._general_advice_cache.get(category)
+        if advice is None:
+            advice = self._general_advice_cache[category] = tuple(self.plant_db.get_general_advice(category))
+        return advice
+    
+    def _get_seasonal_advice(self, season: str) -> tuple:
+        """Seasonal advice, read from the database once per season and kept as a tuple"""
+        advice = self._seasonal_advice_cache.get(season)
+        if advice is None:
+            advice = self._seasonal_advice_cache[season] = tuple(self.plant_db.get_seasonal_advice(season))
+        return advice
+    
     # Core helper methods (keep all existing ones)
     def _clean_analysis_text(self, analysis: str) -> str:
         """Clean and normalize the analysis text"""
         if not analysis:
             return ""
-        analysis = re.sub(r'^.*?Answer:\s*', '', analysis, flags=re.IGNORECASE)
-        analysis = re.sub(r'^.*?assistant[:\s]*', '', analysis, flags=re.IGNORECASE)
-        analysis = ' '.join(analysis.split())
+        analysis = ANSWER_PREFIX_RE.sub('', analysis, count=1)
+        # Every whitespace character except the plain space is unprintable, so printable
+        # text without double spaces is already normalized and only needs stripping
+        if "  " in analysis or not analysis.isprintable():
+            analysis = ' '.join(analysis.split())
         return analysis.strip()
     
     def _has_definitive_problems(self, analysis_lower: str) -> bool:
         """Check if analysis contains definitive problems"""
-        definitive_problems = [
-            r"\bfungal\s+infection\b", r"\bbacterial\s+infection\b", r"\bviral\s+infection\b", 
-            r"\bdisease\b(?!\s+resistant)", r"\binfection\b", r"\bblight\b", r"\brust\b(?!\s+resistant)",
-            r"\bmildew\b", r"\brot\b(?:ting)?\b", r"\bfungal\b", r"\bbacterial\b", r"\bviral\b"
-        ]
-        return any(re.search(pattern, analysis_lower) for pattern in definitive_problems)
+        return DEFINITIVE_PROBLEM_RE.search(analysis_lower) is not None
     
     def _has_implicit_problems(self, analysis_lower: str) -> bool:
         """Check for implicit problem indicators"""
-        implicit_problems = [
-            r"\bbrown\b.*\b(edge|tip|spot)\b", r"\byellow\b.*\b(leaf|leave)\b", 
-            r"\bwilt\b", r"\bdamage\b", r"\bstress\b", r"\bproblem\b", r"\bissue\b"
-        ]
-        return any(re.search(pattern, analysis_lower) for pattern in implicit_problems)
+        return IMPLICIT_PROBLEM_RE.search(analysis_lower) is not None
     
     def _is_negative_context(self, surrounding_text: str, match_text: str) -> bool:
         """Check if symptom match is in negative context"""
-        negative_indicators = ['no', 'without', 'absence of', 'not', 'free from', 'clear of']
         try:
             match_pos = surrounding_text.find(match_text)
             if match_pos == -1:
                 return False
-            words_before = surrounding_text[:match_pos].split()
-            recent_words = words_before[-3:] if len(words_before) >= 3 else words_before
-            return any(neg_word in recent_words for neg_word in negative_indicators)
+            # Is one of the last three words before the match a negator?
+            return self._NEGATED_TAIL_RE.search(surrounding_text, 0, match_pos) is not None
         except Exception:
             return False
     
-    def _assess_severity_with_db(self, analysis: str, symptoms: List[Dict]) -> str:
+    def _assess_severity_with_db(self, analysis: str, symptoms: List[Dict], analysis_lower: str = None) -> str:
         """Assess severity using database information"""
         if not analysis:
             return "none"
             
-        analysis_lower = analysis.lower()
+        if analysis_lower is None:
+            analysis_lower = analysis.lower()
         
         if any(symptom.get("name") == "healthy_plant" for symptom in symptoms):
             return "none"
         
-        for severity, keywords in self.severity_keywords.items():
-            for keyword in keywords:
-                if keyword in analysis_lower:
-                    logger.info(f"Found severity keyword '{keyword}' -> {severity}")
-                    return severity
+        for severity, pattern in self._severity_patterns:
+            match = pattern.search(analysis_lower)
+            if match:
+                logger.info("Found severity keyword '%s' -> %s", match.group(), severity)
+                return severity
         
         for symptom in symptoms:
             symptom_name = symptom["name"]
-            for condition_name, condition_info in self.all_conditions.items():
-                if symptom_name.startswith(condition_name):
-                    treatments = condition_info.get("treatments", [])
-                    if any(t.get("type") == "emergency" for t in treatments):
-                        return "critical"
-                    elif any(t.get("type") in ["removal", "antibiotic"] for t in treatments):
-                        return "high"
+            for condition_name in self._get_condition_prefixes(symptom_name):
+                treatments = self.all_conditions[condition_name].get("treatments", [])
+                if any(t.get("type") == "emergency" for t in treatments):
+                    return "critical"
+                elif any(t.get("type") in {"removal", "antibiotic"} for t in treatments):
+                    return "high"
         
         if len(symptoms) >= 3:
             return "moderate"
@@ -1035,23 +1466,12 @@ class PlantHealthAnalyzer:
         else:
             return "none"
     
-    def _deduplicate_symptoms(self, symptoms: List[Dict]) -> List[Dict]:
-        """Remove duplicate symptoms while preserving highest confidence"""
-        seen = {}
-        for symptom in symptoms:
-            name = symptom["name"]
-            if name not in seen or symptom["confidence"] > seen[name]["confidence"]:
-                seen[name] = symptom
-        return list(seen.values())
-    
     def _calculate_symptom_confidence_with_db(self, text_match: str, symptom_name: str, full_analysis: str) -> float:
         """Calculate confidence using database information"""
         base_confidence = 0.7
         
-        for condition_name, condition_info in self.all_conditions.items():
-            if symptom_name.startswith(condition_name):
-                base_confidence = 0.8
-                break
+        if self._get_condition_prefixes(symptom_name):
+            base_confidence = 0.8
         
         if len(text_match) > 10:
             base_confidence += 0.1
@@ -1061,15 +1481,43 @@ class PlantHealthAnalyzer:
         
         return min(max(base_confidence, 0.1), 1.0)
     
-    def _get_matched_symptoms(self, condition_info: Dict, symptoms: List[Dict]) -> List[str]:
+    def _get_matched_symptoms(self, condition_info: Dict, symptoms: Union[List[Dict], SymptomColumns],
+                              condition_name: str = None) -> List[str]:
         """Get list of symptoms that match this condition"""
         matched = []
-        condition_symptoms = set(condition_info.get("symptoms", []))
-        condition_keywords = set(condition_info.get("keywords", []))
-        
-        for symptom in symptoms:
-            if (symptom["name"] in condition_symptoms or 
-                any(keyword in symptom["text_match"] for keyword in condition_keywords)):
-                matched.append(symptom["name"])
+        columns = SymptomColumns.of(symptoms)
         
-        return matched
\ No newline at end of file
+        # Database conditions have their symptom and keyword sets prebuilt
+        index = self._condition_index.get(condition_name)
+        if index is not None and self.all_conditions.get(condition_name) is condition_info:
+            condition_symptoms = index["symptoms"]
+            condition_keywords = index["keyword_set"]
+        else:
+            condition_symptoms = set(condition_info.get("symptoms", []))
+            condition_keywords = set(condition_info.get("keywords", []))
+        
+        # Database keywords were already tested against each matched text
+        if condition_keywords <= self._database_keywords:
+            for name, keyword_hits in zip(columns.names, self._keyword_hits(columns)):
+                if name in condition_symptoms or not condition_keywords.isdisjoint(keyword_hits):
+                    matched.append(name)
+            return matched
+        
+        for name, text_match in zip(columns.names, columns.text_matches):
+            if (name in condition_symptoms or 
+                any(keyword in text_match for keyword in condition_keywords)):
+                matched.append(name)
+        
+        return matched
+    
+    def _keyword_hits(self, columns: SymptomColumns) -> tuple:
+        """Database keywords found in each symptom's matched text, computed once per symptom list"""
+        if columns.keyword_hits is None:
+            hits_by_text = {}
+            for text_match in columns.text_matches:
+                if text_match not in hits_by_text:
+                    hits_by_text[text_match] = frozenset(
+                        keyword for keyword in self._database_keywords if keyword in text_match
+                    )
+            columns.keyword_hits = tuple(hits_by_text[text_match] for text_match in columns.text_matches)
+        return columns.keyword_hits
\ No newline at end of file
@@ -1,10 +1,279 @@
 # utils.py - Helper Functions for AI Plant Doctor
 
 import re
-from typing import Dict, Any, List
+import functools
+from typing import Dict, Any, List, Optional, Union
 from PIL import Image
 import io
 import base64
+from types import MappingProxyType
+
+# Read-only default for missing condition info (lookups only, nothing to allocate per call)
+EMPTY_INFO = MappingProxyType({})
+
+# Health indicator card shown instead of a symptom list for healthy plants
+HEALTH_INDICATORS_HTML = (
+    "<div class='diagnosis-card'><h3>🌱 Health Indicators</h3><ul>"
+    "<li><strong>✅ Healthy Appearance</strong> (confidence: 90%)</li>"
+    "<li><strong>🍃 Good Leaf Condition</strong></li>"
+    "<li><strong>🌿 No Visible Problems</strong></li>"
+    "</ul></div>"
+)
+
+# Report icons and labels per severity, urgency and confidence level
+SEVERITY_EMOJI = {
+    "critical": "🚨",
+    "high": "⚠️",
+    "moderate": "⚖️",
+    "mild": "✅",
+    "none": "🌱"  # New emoji for healthy plants
+}
+URGENCY_EMOJI = {"high": "🔴", "medium": "🟡", "low": "🟢"}
+SEVERITY_BADGES = {
+    "critical": "🔴 CRITICAL",
+    "high": "🟠 HIGH",
+    "moderate": "🟡 MODERATE",
+    "mild": "🟢 MILD",
+    "none": "🌱 HEALTHY",
+    "unknown": "⚪ UNKNOWN"
+}
+CONFIDENCE_INDICATORS = {
+    "high": "🎯 High Confidence",
+    "medium": "🎲 Medium Confidence",
+    "low": "❓ Low Confidence"
+}
+
+# Recommendation per (confidence, severity group); other combinations fall back per group
+SEVERITY_GROUPS = {"none": "healthy", "healthy": "healthy", "mild": "minor", "moderate": "minor",
+                   "high": "serious", "critical": "serious"}
+MEDIUM_CONFIDENCE_RECOMMENDATION = (
+    "Moderate confidence in diagnosis. Try recommended treatments and monitor closely. Consider getting a second opinion."
+)
+LOW_CONFIDENCE_RECOMMENDATION = (
+    "Low confidence diagnosis. Consider consulting a local plant expert or extension service for professional advice."
+)
+CONFIDENCE_RECOMMENDATIONS = {
+    ("high", "healthy"): "High confidence that your plant is healthy! Continue your excellent care routine.",
+    ("medium", "healthy"): "Plant appears healthy. Keep monitoring and maintain current care practices.",
+    ("high", "minor"): "Diagnosis appears reliable. Follow treatment recommendations and monitor progress.",
+    ("high", "serious"): "High confidence diagnosis of serious issue. Take immediate action and consider professional consultation.",
+    ("medium", "minor"): MEDIUM_CONFIDENCE_RECOMMENDATION,
+    ("medium", "serious"): MEDIUM_CONFIDENCE_RECOMMENDATION,
+    ("medium", "other"): MEDIUM_CONFIDENCE_RECOMMENDATION
+}
+HEALTHY_LOW_CONFIDENCE_RECOMMENDATION = (
+    "Plant seems okay, but consider getting a second opinion if you notice any changes."
+)
+
+# Plant, plant-part, growing-condition and care terms, reported in this order
+PLANT_KEYWORDS = (
+    # Common plants
+    'tomato', 'pepper', 'cucumber', 'lettuce', 'spinach', 'carrot', 'potato',
+    'rose', 'tulip', 'sunflower', 'marigold', 'petunia', 'geranium',
+    'oak', 'maple', 'pine', 'birch', 'cherry', 'apple', 'orange',
+    'basil', 'oregano', 'thyme', 'parsley', 'mint', 'rosemary',
+    
+    # Plant parts
+    'leaf', 'leaves', 'stem', 'branch', 'flower', 'bud', 'fruit', 'root',
+    
+    # Growing conditions
+    'indoor', 'outdoor', 'garden', 'greenhouse', 'pot', 'container',
+    'shade', 'sun', 'partial', 'full', 'morning', 'afternoon',
+    'humid', 'dry', 'wet', 'moist', 'drought', 'rain',
+    
+    # Care activities
+    'watering', 'fertilizer', 'pruning', 'repotting', 'transplant',
+    'mulch', 'compost', 'pesticide', 'fungicide'
+)
+
+# Plant-related keywords that should be present in an image description
+IMAGE_PLANT_KEYWORDS = (
+    'plant', 'leaf', 'leaves', 'stem', 'branch', 'flower', 'tree', 'bush',
+    'vegetation', 'foliage', 'garden', 'crop', 'herb', 'shrub', 'vine'
+)
+
+# Non-plant keywords that indicate it's not a plant
+IMAGE_NON_PLANT_KEYWORDS = (
+    'person', 'people', 'face', 'car', 'building', 'phone', 'computer',
+    'food', 'meal', 'pizza', 'bread', 'animal', 'dog', 'cat', 'bird'
+)
+
+# Large downscales first shrink by an integer factor (Image.reduce) so the Lanczos filter
+# only covers the last step of at most this ratio; smaller downscales are plain Lanczos
+RESIZE_REDUCING_GAP = 1.5
+
+# Rough treatment cost ranges per type and budget level
+TREATMENT_COST_ESTIMATES = {
+    "organic": {"low": "$5-15", "medium": "$15-30", "high": "$30-50"},
+    "fungicide": {"low": "$10-25", "medium": "$25-50", "high": "$50-100"},
+    "bactericide": {"low": "$15-30", "medium": "$30-60", "high": "$60-120"},
+    "fertilizer": {"low": "$10-20", "medium": "$20-40", "high": "$40-80"},
+    "cultural": {"low": "$0-10", "medium": "$10-25", "high": "$25-50"}
+}
+
+def _average_costs(cost_ranges: Dict[str, str]) -> Dict[str, float]:
+    """
+    Middle value of each cost range like "$10-25"
+    """
+    average_costs = {}
+    for level, range_str in cost_ranges.items():
+        numbers = re.findall(r'\d+', range_str)
+        if len(numbers) >= 2:
+            average_costs[level] = (int(numbers[0]) + int(numbers[1])) / 2
+    return average_costs
+
+TREATMENT_COST_AVERAGES = {
+    treatment_type: _average_costs(cost_ranges) for treatment_type, cost_ranges in TREATMENT_COST_ESTIMATES.items()
+}
+
+# Emoji that already mark a prevention tip, searched as one alternation
+TIP_EMOJIS = ('🔍', '💧', '🌬️', '🧹', '🌱', '📅', '🌡️', '🧪')
+TIP_EMOJI_RE = re.compile("|".join(re.escape(emoji) for emoji in TIP_EMOJIS))
+
+# Typical recovery time per condition category and severity
+RECOVERY_TIMES = {
+    "fungal": {"mild": "1-2 weeks", "moderate": "2-4 weeks", "high": "4-8 weeks", "critical": "8+ weeks"},
+    "bacterial": {"mild": "2-3 weeks", "moderate": "3-6 weeks", "high": "6-12 weeks", "critical": "12+ weeks"},
+    "nutrient": {"mild": "1-2 weeks", "moderate": "2-3 weeks", "high": "3-4 weeks", "critical": "4+ weeks"},
+    "environmental": {"mild": "few days", "moderate": "1-2 weeks", "high": "2-4 weeks", "critical": "4+ weeks"},
+    "pest": {"mild": "1 week", "moderate": "2-3 weeks", "high": "3-6 weeks", "critical": "6+ weeks"}
+}
+
+# Seasonal care tasks per plant type
+CARE_SCHEDULES = {
+    "tomato": {
+        "spring": ["Start seeds indoors", "Prepare soil", "Plan garden layout"],
+        "summer": ["Water consistently", "Stake plants", "Monitor for pests", "Harvest regularly"],
+        "fall": ["Collect seeds", "Remove plants", "Prepare soil for winter"],
+        "winter": ["Plan next year", "Order seeds", "Maintain tools"]
+    },
+    "rose": {
+        "spring": ["Prune dead canes", "Apply fertilizer", "Mulch around base"],
+        "summer": ["Water regularly", "Deadhead flowers", "Monitor for diseases"],
+        "fall": ["Reduce watering", "Clean up leaves", "Apply winter protection"],
+        "winter": ["Dormant season care", "Plan pruning", "Order new varieties"]
+    },
+    "general": {
+        "spring": ["Clean up winter damage", "Apply fertilizer", "Start pest monitoring"],
+        "summer": ["Maintain watering", "Monitor plant health", "Harvest/deadhead"],
+        "fall": ["Prepare for winter", "Clean up debris", "Plant cover crops"],
+        "winter": ["Protect tender plants", "Plan next year", "Maintain tools"]
+    }
+}
+
+# Pathogen background for common conditions
+SCIENTIFIC_INFO = {
+    "fungal_leaf_spot": {
+        "pathogen": "Various fungi (Septoria, Alternaria, Cercospora species)",
+        "lifecycle": "Spores spread by water, wind, and infected plant material",
+        "conditions": "Thrives in warm, humid conditions with poor air circulation"
+    },
+    "rust_disease": {
+        "pathogen": "Various rust fungi (Puccinia, Uromyces species)",
+        "lifecycle": "Complex lifecycle often involving alternate hosts",
+        "conditions": "Cool, moist conditions favor spore germination"
+    },
+    "powdery_mildew": {
+        "pathogen": "Various fungi (Erysiphe, Podosphaera, Sphaerotheca species)",
+        "lifecycle": "Spreads rapidly in warm, dry conditions with high humidity",
+        "conditions": "Unlike other fungi, doesn't require free water on leaves"
+    },
+    "bacterial_spot": {
+        "pathogen": "Various bacteria (Xanthomonas, Pseudomonas species)",
+        "lifecycle": "Spreads through water splash and contaminated tools",
+        "conditions": "Warm, wet conditions with poor air circulation"
+    },
+    "mosaic_virus": {
+        "pathogen": "Various viruses (TMV, CMV, TSWV)",
+        "lifecycle": "Transmitted by insects, contaminated tools, or infected seeds",
+        "conditions": "No environmental requirements - spreads through vectors"
+    }
+}
+
+# General plant care advice per season
+SEASONAL_ADVICE = {
+    "spring": [
+        "🌱 Start regular monitoring as plants become active",
+        "💊 Apply preventive treatments before problems start", 
+        "🧹 Clean up winter debris that can harbor diseases",
+        "✂️ Prune damaged or dead growth from winter",
+        "🌿 Begin fertilization program for growing season"
+    ],
+    "summer": [
+        "💧 Monitor watering needs closely in hot weather",
+        "🌡️ Watch for heat stress symptoms on plants",
+        "🦠 Be vigilant for disease in humid conditions",
+        "🐛 Check for increased pest activity",
+        "🌳 Provide shade for sensitive plants during heat waves"
+    ],
+    "fall": [
+        "🧹 Clean up fallen leaves to prevent disease carryover",
+        "💧 Adjust watering as temperatures cool",
+        "🌱 Prepare plants for winter dormancy",
+        "✂️ Do final pruning before dormant season",
+        "🏠 Begin protecting tender plants from cold"
+    ],
+    "winter": [
+        "🏠 Protect tender plants from freezing temperatures",
+        "💧 Reduce watering for dormant plants",
+        "📚 Plan for next year's prevention strategies",
+        "🔍 Monitor houseplants more closely",
+        "🛠️ Clean and maintain garden tools"
+    ]
+}
+
+# Emergency steps for conditions that need a specific response
+EMERGENCY_RESPONSES = {
+    "fire_blight": [
+        "🚨 STOP all watering immediately",
+        "✂️ Prune infected branches 12+ inches below symptoms", 
+        "🧴 Disinfect tools with 70% alcohol between each cut",
+        "🔥 Burn or bag all infected material - DO NOT COMPOST",
+        "📱 Contact extension service for professional guidance"
+    ],
+    "crown_gall": [
+        "🚨 Remove entire plant including all roots",
+        "🚫 Do not replant susceptible species in same location for 3-4 years",
+        "🧹 Sterilize soil if possible",
+        "🧴 Disinfect all tools thoroughly"
+    ],
+    "viral_disease": [
+        "🚨 Isolate plant immediately from other plants",
+        "🦠 Control insect vectors (aphids, whiteflies) aggressively",
+        "✂️ Remove infected plant entirely",
+        "🧴 Disinfect tools with 10% bleach solution"
+    ]
+}
+DEFAULT_EMERGENCY_RESPONSE = [
+    "🚨 Take immediate action to prevent spread",
+    "✂️ Remove all affected plant material",
+    "🧹 Clean up area thoroughly",
+    "📱 Consider professional consultation",
+    "📸 Document progression with photos"
+]
+
+# Symptoms that call for fungicide and debris cleanup in the care checklist
+SPOT_SYMPTOMS = frozenset(["spots", "browning", "blackening"])
+
+# Characters that are unsafe in file names, each mapped to an underscore
+UNSAFE_FILENAME_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
+# Condition type terms and the recovery-time category they map to, checked in order
+RECOVERY_CATEGORY_TERMS = (
+    ("fungal", "fungal"),
+    ("bacterial", "bacterial"),
+    ("nutrient", "nutrient"),
+    ("deficiency", "nutrient"),
+    ("pest", "pest"),
+    ("insect", "pest")
+)
+
+@functools.lru_cache(maxsize=256)
+def display_name(name: str) -> str:
+    """
+    Title-case a snake_case name for display (names come from a small vocabulary)
+    """
+    return name.replace("_", " ").title()
 
 def ensure_confidence_string(confidence) -> str:
     """
@@ -32,26 +301,21 @@ def format_diagnosis_report(results: Dict[str, Any]) -> str:
     # Extract key information
     severity = results.get("severity_level", "unknown")
     confidence = ensure_confidence_string(results.get("confidence_score", "low"))
-    conditions = results.get("possible_conditions", [])
-    symptoms = results.get("detected_symptoms", [])
-    treatments = results.get("treatments", [])
-    immediate_actions = results.get("immediate_actions", [])
+    conditions = results.get("possible_conditions", ())
+    symptoms = results.get("detected_symptoms", ())
+    treatments = results.get("treatments", ())
+    immediate_actions = results.get("immediate_actions", ())
     
-    # Start building the HTML report
+    # Start building the HTML report (one fragment per section)
     html_parts = []
     
     # Severity indicator
     severity_class = f"severity-{severity}"
-    severity_emoji = {
-        "critical": "🚨",
-        "high": "⚠️", 
-        "moderate": "⚖️",
-        "mild": "✅",
-        "none": "🌱"  # New emoji for healthy plants
-    }.get(severity, "📊")
-    
-    # Special handling for healthy plants
-    if severity == "none":
+    severity_emoji = SEVERITY_EMOJI.get(severity, "📊")
+    
+    # Special handling for healthy plants (a "none" severity marks every section healthy)
+    severity_is_healthy = severity == "none"
+    if severity_is_healthy:
         severity_display = "Healthy"
         severity_class = "severity-healthy"
     else:
@@ -68,24 +332,22 @@ def format_diagnosis_report(results: Dict[str, Any]) -> str:
     # Most likely conditions
     if conditions:
         # Check if this is a healthy plant
-        is_healthy = (severity == "none" or 
+        is_healthy = (severity_is_healthy or 
                      any(condition.get("name") == "healthy_plant" for condition in conditions))
         
         if is_healthy:
-            html_parts.append("<div class='diagnosis-card'>")
-            html_parts.append("<h3>🌱 Plant Health Status</h3>")
+            condition_cards = ["<div class='diagnosis-card'><h3>🌱 Plant Health Status</h3>"]
         else:
-            html_parts.append("<div class='diagnosis-card'>")
-            html_parts.append("<h3>🔍 Most Likely Issues</h3>")
+            condition_cards = ["<div class='diagnosis-card'><h3>🔍 Most Likely Issues</h3>"]
         
         for i, condition in enumerate(conditions[:3], 1):
-            condition_name = condition.get("name", "Unknown").replace("_", " ").title()
+            condition_name = display_name(condition.get("name", "Unknown"))
             condition_confidence = condition.get("confidence", 0)
-            condition_info = condition.get("info", {})
+            condition_info = condition.get("info", EMPTY_INFO)
             
             # Special handling for healthy plants
             if condition_name == "Healthy Plant":
-                html_parts.append(f"""
+                condition_cards.append(f"""
                 <div class="treatment-card" style="background: #e8f5e8; border-left: 4px solid #4CAF50;">
                     <h4>🌱 {condition_name}</h4>
                     <p><strong>Assessment Confidence:</strong> {condition_confidence:.0%}</p>
@@ -93,7 +355,7 @@ def format_diagnosis_report(results: Dict[str, Any]) -> str:
                 </div>
                 """)
             else:
-                html_parts.append(f"""
+                condition_cards.append(f"""
                 <div class="treatment-card">
                     <h4>{i}. {condition_name}</h4>
                     <p><strong>Match Confidence:</strong> {condition_confidence:.0%}</p>
@@ -101,35 +363,24 @@ def format_diagnosis_report(results: Dict[str, Any]) -> str:
                 </div>
                 """)
         
-        html_parts.append("</div>")
+        condition_cards.append("</div>")
+        html_parts.append("".join(condition_cards))
     
     # Detected symptoms
     if symptoms:
         # Check if this is a healthy plant
-        is_healthy = (severity == "none" or 
+        is_healthy = (severity_is_healthy or 
                      any(symptom.get("name") == "healthy_plant" for symptom in symptoms))
         
         if is_healthy:
-            html_parts.append("<div class='diagnosis-card'>")
-            html_parts.append("<h3>🌱 Health Indicators</h3>")
-            html_parts.append("<ul>")
-            html_parts.append("<li><strong>✅ Healthy Appearance</strong> (confidence: 90%)</li>")
-            html_parts.append("<li><strong>🍃 Good Leaf Condition</strong></li>") 
-            html_parts.append("<li><strong>🌿 No Visible Problems</strong></li>")
-            html_parts.append("</ul>")
-            html_parts.append("</div>")
+            html_parts.append(HEALTH_INDICATORS_HTML)
         else:
-            html_parts.append("<div class='diagnosis-card'>")
-            html_parts.append("<h3>🍃 Detected Symptoms</h3>")
-            html_parts.append("<ul>")
-            
-            for symptom in symptoms[:5]:  # Show top 5 symptoms
-                symptom_name = symptom.get("name", "").replace("_", " ").title()
-                symptom_confidence = symptom.get("confidence", 0)
-                html_parts.append(f"<li><strong>{symptom_name}</strong> (confidence: {symptom_confidence:.0%})</li>")
-            
-            html_parts.append("</ul>")
-            html_parts.append("</div>")
+            symptom_items = "".join(
+                f"<li><strong>{display_name(symptom.get('name', ''))}</strong> "
+                f"(confidence: {symptom.get('confidence', 0):.0%})</li>"
+                for symptom in symptoms[:5]  # Show top 5 symptoms
+            )
+            html_parts.append(f"<div class='diagnosis-card'><h3>🍃 Detected Symptoms</h3><ul>{symptom_items}</ul></div>")
     
     # Immediate actions
     if immediate_actions:
@@ -137,51 +388,40 @@ def format_diagnosis_report(results: Dict[str, Any]) -> str:
         has_emergency = any("URGENT" in action for action in immediate_actions)
         
         if has_emergency:
-            html_parts.append("<div class='emergency-alert'>")
-            html_parts.append("<h3>🚨 URGENT ACTIONS NEEDED</h3>")
+            actions_header = "<div class='emergency-alert'><h3>🚨 URGENT ACTIONS NEEDED</h3>"
         else:
-            html_parts.append("<div class='diagnosis-card'>")
-            html_parts.append("<h3>⚡ Immediate Actions</h3>")
+            actions_header = "<div class='diagnosis-card'><h3>⚡ Immediate Actions</h3>"
         
-        html_parts.append("<ul>")
-        for action in immediate_actions:
-            html_parts.append(f"<li>{action}</li>")
-        html_parts.append("</ul>")
-        html_parts.append("</div>")
+        action_items = "".join(f"<li>{action}</li>" for action in immediate_actions)
+        html_parts.append(f"{actions_header}<ul>{action_items}</ul></div>")
     
     # Treatment recommendations
     if treatments:
-        html_parts.append("<div class='diagnosis-card'>")
-        html_parts.append("<h3>💊 Treatment Options</h3>")
+        treatment_cards = ["<div class='diagnosis-card'><h3>💊 Treatment Options</h3>"]
         
         for treatment in treatments[:3]:  # Show top 3 treatments
-            treatment_type = treatment.get("type", "general").replace("_", " ").title()
+            treatment_type = display_name(treatment.get("type", "general"))
             action = treatment.get("action", "No action specified")
             urgency = treatment.get("urgency", "medium")
-            details = treatment.get("details", [])
+            details = treatment.get("details", ())
             
-            urgency_emoji = {
-                "high": "🔴",
-                "medium": "🟡", 
-                "low": "🟢"
-            }.get(urgency, "⭕")
+            urgency_emoji = URGENCY_EMOJI.get(urgency, "⭕")
             
-            html_parts.append(f"""
+            if details:
+                detail_items = "".join(f"<li>{detail}</li>" for detail in details)
+                details_html = f"<p><strong>Details:</strong></p><ul>{detail_items}</ul>"
+            else:
+                details_html = ""
+            
+            treatment_cards.append(f"""
             <div class="treatment-card">
                 <h4>{urgency_emoji} {treatment_type}</h4>
                 <p><strong>Action:</strong> {action}</p>
                 <p><strong>Urgency:</strong> {urgency.title()}</p>
-            """)
-            
-            if details:
-                html_parts.append("<p><strong>Details:</strong></p><ul>")
-                for detail in details:
-                    html_parts.append(f"<li>{detail}</li>")
-                html_parts.append("</ul>")
-            
-            html_parts.append("</div>")
+            {details_html}</div>""")
         
-        html_parts.append("</div>")
+        treatment_cards.append("</div>")
+        html_parts.append("".join(treatment_cards))
     
     # Confidence and next steps
     html_parts.append(f"""
@@ -200,24 +440,14 @@ def get_confidence_recommendation(confidence: str, severity: str) -> str:
     """
     Get recommendation based on confidence and severity levels
     """
-    # Handle healthy plants first
-    if severity == "none" or severity == "healthy":
-        if confidence == "high":
-            return "High confidence that your plant is healthy! Continue your excellent care routine."
-        elif confidence == "medium":
-            return "Plant appears healthy. Keep monitoring and maintain current care practices."
+    severity_group = SEVERITY_GROUPS.get(severity, "other")
+    recommendation = CONFIDENCE_RECOMMENDATIONS.get((confidence, severity_group))
+    if recommendation is None:
+        if severity_group == "healthy":
+            recommendation = HEALTHY_LOW_CONFIDENCE_RECOMMENDATION
         else:
-            return "Plant seems okay, but consider getting a second opinion if you notice any changes."
-    
-    # Handle problem plants
-    if confidence == "high" and severity in ["mild", "moderate"]:
-        return "Diagnosis appears reliable. Follow treatment recommendations and monitor progress."
-    elif confidence == "high" and severity in ["high", "critical"]:
-        return "High confidence diagnosis of serious issue. Take immediate action and consider professional consultation."
-    elif confidence == "medium":
-        return "Moderate confidence in diagnosis. Try recommended treatments and monitor closely. Consider getting a second opinion."
-    else:
-        return "Low confidence diagnosis. Consider consulting a local plant expert or extension service for professional advice."
+            recommendation = LOW_CONFIDENCE_RECOMMENDATION
+    return recommendation
 
 def format_symptoms_list(symptoms: List[Dict]) -> str:
     """
@@ -228,7 +458,7 @@ def format_symptoms_list(symptoms: List[Dict]) -> str:
     
     formatted = []
     for symptom in symptoms:
-        name = symptom.get("name", "").replace("_", " ").title()
+        name = display_name(symptom.get("name", ""))
         confidence = symptom.get("confidence", 0)
         formatted.append(f"• {name} ({confidence:.0%} confidence)")
     
@@ -245,7 +475,7 @@ def format_treatments_text(treatments: List[Dict]) -> str:
     for i, treatment in enumerate(treatments, 1):
         action = treatment.get("action", "No action specified")
         urgency = treatment.get("urgency", "medium")
-        details = treatment.get("details", [])
+        details = treatment.get("details", ())
         
         formatted.append(f"{i}. **{action}** ({urgency} priority)")
         
@@ -273,7 +503,7 @@ def resize_image_for_analysis(image: Image.Image, max_size: int = 1024) -> Image
         new_height = max_size
         new_width = int((width * max_size) / height)
     
-    return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    return image.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=RESIZE_REDUCING_GAP)
 
 def validate_image(image: Image.Image) -> tuple[bool, str]:
     """
@@ -303,72 +533,69 @@ def validate_image(image: Image.Image) -> tuple[bool, str]:
     except Exception as e:
         return False, f"Error validating image: {str(e)}"
 
-def extract_plant_keywords(text: str) -> List[str]:
+def validate_image_source(source: Union[str, bytes, io.IOBase],
+                          max_size: int = 1024) -> tuple[bool, str, Optional[Image.Image]]:
     """
-    Extract plant-related keywords from user input
+    Validate an image file path, encoded bytes or binary stream from its header,
+    decoding only images that pass.
+    
+    Returns (is_valid, message, image). Unlike validate_image, the image is decoded here:
+    it is None when validation fails, and JPEGs come back draft-scaled (the smallest
+    decoder scale still covering max_size), not at full resolution.
     """
-    plant_keywords = [
-        # Common plants
-        'tomato', 'pepper', 'cucumber', 'lettuce', 'spinach', 'carrot', 'potato',
-        'rose', 'tulip', 'sunflower', 'marigold', 'petunia', 'geranium',
-        'oak', 'maple', 'pine', 'birch', 'cherry', 'apple', 'orange',
-        'basil', 'oregano', 'thyme', 'parsley', 'mint', 'rosemary',
-        
-        # Plant parts
-        'leaf', 'leaves', 'stem', 'branch', 'flower', 'bud', 'fruit', 'root',
-        
-        # Growing conditions
-        'indoor', 'outdoor', 'garden', 'greenhouse', 'pot', 'container',
-        'shade', 'sun', 'partial', 'full', 'morning', 'afternoon',
-        'humid', 'dry', 'wet', 'moist', 'drought', 'rain',
-        
-        # Care activities
-        'watering', 'fertilizer', 'pruning', 'repotting', 'transplant',
-        'mulch', 'compost', 'pesticide', 'fungicide'
-    ]
+    try:
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        image = Image.open(source)  # Lazy: only the header has been read
+    except Exception as e:
+        return False, f"Error validating image: {str(e)}", None
     
-    found_keywords = []
-    text_lower = text.lower()
+    # Size and mode come from the header, so rejected images are never decoded
+    is_valid, message = validate_image(image)
+    if not is_valid:
+        image.close()
+        return False, message, None
     
-    for keyword in plant_keywords:
-        if keyword in text_lower:
-            found_keywords.append(keyword)
+    try:
+        # JPEG decodes straight at the smallest DCT scale still covering the analysis size
+        width, height = image.size
+        scale = max(width, height) / max_size
+        if scale > 1:
+            image.draft("RGB", (int(width / scale), int(height / scale)))
+        image.load()
+    except Exception as e:
+        image.close()
+        return False, f"Error validating image: {str(e)}", None
     
-    return found_keywords
+    return True, message, image
+
+def extract_plant_keywords(text: str) -> List[str]:
+    """
+    Extract plant-related keywords from user input
+    """
+    # Substring tests over a short text: faster than one regex pass and also match
+    # inside longer words (e.g. "leaf" in "leafy")
+    text_lower = text.lower()
+    return [keyword for keyword in PLANT_KEYWORDS if keyword in text_lower]
 
 def create_severity_badge(severity: str) -> str:
     """
     Create a colored badge for severity level
     """
-    badges = {
-        "critical": "🔴 CRITICAL",
-        "high": "🟠 HIGH", 
-        "moderate": "🟡 MODERATE",
-        "mild": "🟢 MILD",
-        "none": "🌱 HEALTHY",
-        "unknown": "⚪ UNKNOWN"
-    }
-    return badges.get(severity, "⚪ UNKNOWN")
+    return SEVERITY_BADGES.get(severity, "⚪ UNKNOWN")
 
 def format_confidence_indicator(confidence: str) -> str:
     """
     Format confidence level with appropriate emoji
     """
-    indicators = {
-        "high": "🎯 High Confidence",
-        "medium": "🎲 Medium Confidence", 
-        "low": "❓ Low Confidence"
-    }
-    return indicators.get(confidence, "❓ Unknown Confidence")
+    return CONFIDENCE_INDICATORS.get(confidence, "❓ Unknown Confidence")
 
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize filename for safe file operations
     """
-    # Remove or replace unsafe characters
-    unsafe_chars = '<>:"/\\|?*'
-    for char in unsafe_chars:
-        filename = filename.replace(char, '_')
+    # Replace unsafe characters in one pass
+    filename = filename.translate(UNSAFE_FILENAME_TABLE)
     
     # Remove leading/trailing spaces and dots
     filename = filename.strip(' .')
@@ -387,7 +614,7 @@ def create_diagnosis_summary(results: Dict[str, Any]) -> str:
         return "❌ Diagnosis failed"
     
     severity = results.get("severity_level", "unknown")
-    conditions = results.get("possible_conditions", [])
+    conditions = results.get("possible_conditions", ())
     confidence = ensure_confidence_string(results.get("confidence_score", "low"))
     
     # Handle healthy plants
@@ -396,7 +623,7 @@ def create_diagnosis_summary(results: Dict[str, Any]) -> str:
     
     # Handle problem plants
     if conditions:
-        top_condition = conditions[0].get("name", "unknown issue").replace("_", " ").title()
+        top_condition = display_name(conditions[0].get("name", "unknown issue"))
         return f"{create_severity_badge(severity)} - Likely {top_condition} ({confidence} confidence)"
     else:
         return f"{create_severity_badge(severity)} - General plant stress detected ({confidence} confidence)"
@@ -410,8 +637,8 @@ def format_prevention_tips(tips: List[str]) -> str:
     
     formatted_tips = []
     for tip in tips:
-        # Add emoji if not already present
-        if not any(emoji in tip for emoji in ['🔍', '💧', '🌬️', '🧹', '🌱', '📅', '🌡️', '🧪']):
+        # Add bullet if no tip emoji is already present
+        if not TIP_EMOJI_RE.search(tip):
             tip = f"• {tip}"
         formatted_tips.append(tip)
     
@@ -421,26 +648,14 @@ def estimate_recovery_time(severity: str, condition_type: str) -> str:
     """
     Estimate recovery time based on severity and condition type
     """
-    base_times = {
-        "fungal": {"mild": "1-2 weeks", "moderate": "2-4 weeks", "high": "4-8 weeks", "critical": "8+ weeks"},
-        "bacterial": {"mild": "2-3 weeks", "moderate": "3-6 weeks", "high": "6-12 weeks", "critical": "12+ weeks"},
-        "nutrient": {"mild": "1-2 weeks", "moderate": "2-3 weeks", "high": "3-4 weeks", "critical": "4+ weeks"},
-        "environmental": {"mild": "few days", "moderate": "1-2 weeks", "high": "2-4 weeks", "critical": "4+ weeks"},
-        "pest": {"mild": "1 week", "moderate": "2-3 weeks", "high": "3-6 weeks", "critical": "6+ weeks"}
-    }
-    
-    # Extract condition category
-    category = "environmental"  # default
-    if "fungal" in condition_type.lower():
-        category = "fungal"
-    elif "bacterial" in condition_type.lower():
-        category = "bacterial"
-    elif "nutrient" in condition_type.lower() or "deficiency" in condition_type.lower():
-        category = "nutrient"
-    elif "pest" in condition_type.lower() or "insect" in condition_type.lower():
-        category = "pest"
+    # Extract condition category (first matching term wins, environmental by default)
+    condition_type_lower = condition_type.lower()
+    category = next(
+        (category for term, category in RECOVERY_CATEGORY_TERMS if term in condition_type_lower),
+        "environmental"
+    )
     
-    return base_times.get(category, {}).get(severity, "timeframe varies")
+    return RECOVERY_TIMES[category].get(severity, "timeframe varies")
 
 def create_treatment_timeline(treatments: List[Dict]) -> str:
     """
@@ -452,19 +667,24 @@ def create_treatment_timeline(treatments: List[Dict]) -> str:
     timeline = []
     timeline.append("📅 **Treatment Timeline:**\n")
     
-    immediate_treatments = [t for t in treatments if t.get("urgency") == "high"]
-    regular_treatments = [t for t in treatments if t.get("urgency") != "high"]
+    # One pass: split the bullet lines by urgency
+    immediate_items = []
+    regular_items = []
+    for treatment in treatments:
+        item = f"• {treatment.get('action', 'Action not specified')}"
+        if treatment.get("urgency") == "high":
+            immediate_items.append(item)
+        else:
+            regular_items.append(item)
     
-    if immediate_treatments:
+    if immediate_items:
         timeline.append("**Immediate (within 24 hours):**")
-        for treatment in immediate_treatments:
-            timeline.append(f"• {treatment.get('action', 'Action not specified')}")
+        timeline.extend(immediate_items)
         timeline.append("")
     
-    if regular_treatments:
+    if regular_items:
         timeline.append("**Ongoing treatment:**")
-        for treatment in regular_treatments:
-            timeline.append(f"• {treatment.get('action', 'Action not specified')}")
+        timeline.extend(regular_items)
     
     timeline.append("\n📋 **Follow-up:** Monitor progress and repeat treatments as recommended")
     
@@ -482,22 +702,22 @@ def generate_care_checklist(results: Dict[str, Any]) -> str:
     ]
     
     # Add specific items based on diagnosis
-    symptoms = results.get("detected_symptoms", [])
+    symptoms = results.get("detected_symptoms", ())
     severity = results.get("severity_level", "mild")
     
-    symptom_names = [s.get("name", "") for s in symptoms]
+    symptom_names = {s.get("name", "") for s in symptoms}
     
     if "wilting" in symptom_names:
         checklist_items.append("□ Adjust watering schedule")
     
-    if any(s in symptom_names for s in ["spots", "browning", "blackening"]):
+    if not SPOT_SYMPTOMS.isdisjoint(symptom_names):
         checklist_items.append("□ Apply fungicide treatment")
         checklist_items.append("□ Clean up fallen debris")
     
     if "yellowing" in symptom_names:
         checklist_items.append("□ Check fertilizer needs")
     
-    if severity in ["high", "critical"]:
+    if severity in {"high", "critical"}:
         checklist_items.append("□ Take photos to track progress")
         checklist_items.append("□ Consider professional consultation")
     
@@ -507,28 +727,7 @@ def get_plant_care_schedule(plant_type: str, season: str) -> str:
     """
     Generate a care schedule based on plant type and season
     """
-    schedules = {
-        "tomato": {
-            "spring": ["Start seeds indoors", "Prepare soil", "Plan garden layout"],
-            "summer": ["Water consistently", "Stake plants", "Monitor for pests", "Harvest regularly"],
-            "fall": ["Collect seeds", "Remove plants", "Prepare soil for winter"],
-            "winter": ["Plan next year", "Order seeds", "Maintain tools"]
-        },
-        "rose": {
-            "spring": ["Prune dead canes", "Apply fertilizer", "Mulch around base"],
-            "summer": ["Water regularly", "Deadhead flowers", "Monitor for diseases"],
-            "fall": ["Reduce watering", "Clean up leaves", "Apply winter protection"],
-            "winter": ["Dormant season care", "Plan pruning", "Order new varieties"]
-        },
-        "general": {
-            "spring": ["Clean up winter damage", "Apply fertilizer", "Start pest monitoring"],
-            "summer": ["Maintain watering", "Monitor plant health", "Harvest/deadhead"],
-            "fall": ["Prepare for winter", "Clean up debris", "Plant cover crops"],
-            "winter": ["Protect tender plants", "Plan next year", "Maintain tools"]
-        }
-    }
-    
-    schedule = schedules.get(plant_type.lower(), schedules["general"])
+    schedule = CARE_SCHEDULES.get(plant_type.lower(), CARE_SCHEDULES["general"])
     tasks = schedule.get(season.lower(), ["No specific tasks for this season"])
     
     return f"**{season.title()} Care for {plant_type.title()}:**\n" + "\n".join([f"• {task}" for task in tasks])
@@ -537,35 +736,7 @@ def format_scientific_info(condition_name: str) -> str:
     """
     Format scientific information about a plant condition
     """
-    scientific_info = {
-        "fungal_leaf_spot": {
-            "pathogen": "Various fungi (Septoria, Alternaria, Cercospora species)",
-            "lifecycle": "Spores spread by water, wind, and infected plant material",
-            "conditions": "Thrives in warm, humid conditions with poor air circulation"
-        },
-        "rust_disease": {
-            "pathogen": "Various rust fungi (Puccinia, Uromyces species)",
-            "lifecycle": "Complex lifecycle often involving alternate hosts",
-            "conditions": "Cool, moist conditions favor spore germination"
-        },
-        "powdery_mildew": {
-            "pathogen": "Various fungi (Erysiphe, Podosphaera, Sphaerotheca species)",
-            "lifecycle": "Spreads rapidly in warm, dry conditions with high humidity",
-            "conditions": "Unlike other fungi, doesn't require free water on leaves"
-        },
-        "bacterial_spot": {
-            "pathogen": "Various bacteria (Xanthomonas, Pseudomonas species)",
-            "lifecycle": "Spreads through water splash and contaminated tools",
-            "conditions": "Warm, wet conditions with poor air circulation"
-        },
-        "mosaic_virus": {
-            "pathogen": "Various viruses (TMV, CMV, TSWV)",
-            "lifecycle": "Transmitted by insects, contaminated tools, or infected seeds",
-            "conditions": "No environmental requirements - spreads through vectors"
-        }
-    }
-    
-    info = scientific_info.get(condition_name)
+    info = SCIENTIFIC_INFO.get(condition_name)
     if not info:
         return "Scientific information not available for this condition."
     
@@ -580,28 +751,15 @@ def calculate_treatment_cost(treatments: List[Dict]) -> Dict[str, str]:
     """
     Estimate treatment costs (rough estimates)
     """
-    cost_estimates = {
-        "organic": {"low": "$5-15", "medium": "$15-30", "high": "$30-50"},
-        "fungicide": {"low": "$10-25", "medium": "$25-50", "high": "$50-100"},
-        "bactericide": {"low": "$15-30", "medium": "$30-60", "high": "$60-120"},
-        "fertilizer": {"low": "$10-20", "medium": "$20-40", "high": "$40-80"},
-        "cultural": {"low": "$0-10", "medium": "$10-25", "high": "$25-50"}
-    }
-    
     total_costs = {"low": 0, "medium": 0, "high": 0}
     
     for treatment in treatments:
         treatment_type = treatment.get("type", "cultural")
-        costs = cost_estimates.get(treatment_type, cost_estimates["cultural"])
+        average_costs = TREATMENT_COST_AVERAGES.get(treatment_type, TREATMENT_COST_AVERAGES["cultural"])
         
         # Add to total (simplified calculation)
-        for level in ["low", "medium", "high"]:
-            range_str = costs[level]
-            # Extract middle value from range like "$10-25"
-            numbers = re.findall(r'\d+', range_str)
-            if len(numbers) >= 2:
-                avg_cost = (int(numbers[0]) + int(numbers[1])) / 2
-                total_costs[level] += avg_cost
+        for level, avg_cost in average_costs.items():
+            total_costs[level] += avg_cost
     
     return {
         "budget": f"${total_costs['low']:.0f}-{total_costs['medium']:.0f}",
@@ -613,38 +771,7 @@ def get_seasonal_advice(season: str) -> List[str]:
     """
     Get general seasonal plant care advice
     """
-    seasonal_advice = {
-        "spring": [
-            "🌱 Start regular monitoring as plants become active",
-            "💊 Apply preventive treatments before problems start", 
-            "🧹 Clean up winter debris that can harbor diseases",
-            "✂️ Prune damaged or dead growth from winter",
-            "🌿 Begin fertilization program for growing season"
-        ],
-        "summer": [
-            "💧 Monitor watering needs closely in hot weather",
-            "🌡️ Watch for heat stress symptoms on plants",
-            "🦠 Be vigilant for disease in humid conditions",
-            "🐛 Check for increased pest activity",
-            "🌳 Provide shade for sensitive plants during heat waves"
-        ],
-        "fall": [
-            "🧹 Clean up fallen leaves to prevent disease carryover",
-            "💧 Adjust watering as temperatures cool",
-            "🌱 Prepare plants for winter dormancy",
-            "✂️ Do final pruning before dormant season",
-            "🏠 Begin protecting tender plants from cold"
-        ],
-        "winter": [
-            "🏠 Protect tender plants from freezing temperatures",
-            "💧 Reduce watering for dormant plants",
-            "📚 Plan for next year's prevention strategies",
-            "🔍 Monitor houseplants more closely",
-            "🛠️ Clean and maintain garden tools"
-        ]
-    }
-    
-    return seasonal_advice.get(season.lower(), [])
+    return list(SEASONAL_ADVICE.get(season.lower(), ()))  # Copy: callers may extend it
 
 def format_emergency_response(severity: str, condition_name: str) -> str:
     """
@@ -653,37 +780,7 @@ def format_emergency_response(severity: str, condition_name: str) -> str:
     if severity not in ["high", "critical"]:
         return "No emergency response needed for this severity level."
     
-    emergency_responses = {
-        "fire_blight": [
-            "🚨 STOP all watering immediately",
-            "✂️ Prune infected branches 12+ inches below symptoms", 
-            "🧴 Disinfect tools with 70% alcohol between each cut",
-            "🔥 Burn or bag all infected material - DO NOT COMPOST",
-            "📱 Contact extension service for professional guidance"
-        ],
-        "crown_gall": [
-            "🚨 Remove entire plant including all roots",
-            "🚫 Do not replant susceptible species in same location for 3-4 years",
-            "🧹 Sterilize soil if possible",
-            "🧴 Disinfect all tools thoroughly"
-        ],
-        "viral_disease": [
-            "🚨 Isolate plant immediately from other plants",
-            "🦠 Control insect vectors (aphids, whiteflies) aggressively",
-            "✂️ Remove infected plant entirely",
-            "🧴 Disinfect tools with 10% bleach solution"
-        ]
-    }
-    
-    default_emergency = [
-        "🚨 Take immediate action to prevent spread",
-        "✂️ Remove all affected plant material",
-        "🧹 Clean up area thoroughly",
-        "📱 Consider professional consultation",
-        "📸 Document progression with photos"
-    ]
-    
-    response = emergency_responses.get(condition_name, default_emergency)
+    response = EMERGENCY_RESPONSES.get(condition_name, DEFAULT_EMERGENCY_RESPONSE)
     
     return "**EMERGENCY RESPONSE PROTOCOL:**\n" + "\n".join([f"{i+1}. {action}" for i, action in enumerate(response)])
 
@@ -691,23 +788,11 @@ def validate_plant_image_content(description: str) -> tuple[bool, str, float]:
     """
     Validate if the image description indicates it's actually a plant
     """
-    # Plant-related keywords that should be present
-    plant_keywords = [
-        'plant', 'leaf', 'leaves', 'stem', 'branch', 'flower', 'tree', 'bush', 
-        'vegetation', 'foliage', 'garden', 'crop', 'herb', 'shrub', 'vine'
-    ]
-    
-    # Non-plant keywords that indicate it's not a plant
-    non_plant_keywords = [
-        'person', 'people', 'face', 'car', 'building', 'phone', 'computer',
-        'food', 'meal', 'pizza', 'bread', 'animal', 'dog', 'cat', 'bird'
-    ]
-    
     description_lower = description.lower()
     
     # Count plant vs non-plant keywords
-    plant_score = sum(1 for keyword in plant_keywords if keyword in description_lower)
-    non_plant_score = sum(1 for keyword in non_plant_keywords if keyword in description_lower)
+    plant_score = sum(1 for keyword in IMAGE_PLANT_KEYWORDS if keyword in description_lower)
+    non_plant_score = sum(1 for keyword in IMAGE_NON_PLANT_KEYWORDS if keyword in description_lower)
     
     # Calculate confidence (0-1 scale)
     total_keywords = plant_score + non_plant_score
@@ -721,7 +806,7 @@ def validate_plant_image_content(description: str) -> tuple[bool, str, float]:
     
     if not is_plant:
         if non_plant_score > 0:
-            message = f"This appears to be a {non_plant_keywords[0]} image rather than a plant. Please upload an image of a plant for analysis."
+            message = f"This appears to be a {IMAGE_NON_PLANT_KEYWORDS[0]} image rather than a plant. Please upload an image of a plant for analysis."
         else:
             message = "Unable to identify plant content in this image. Please upload a clear photo of a plant."
     else:
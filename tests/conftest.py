@@ -32,30 +32,31 @@ def mock_validate_image(image):
         return True, "Image is valid"
     return False, "Invalid image format"
 
+MOCK_PLANT_WORDS = ('tomato', 'plant', 'leaf', 'leaves', 'greenhouse', 'garden', 'yellowing')
+
 def mock_extract_plant_keywords(text):
     """Mock plant keyword extraction"""
-    keywords = []
     text_lower = text.lower()
-    plant_words = ['tomato', 'plant', 'leaf', 'leaves', 'greenhouse', 'garden', 'yellowing']
-    for word in plant_words:
-        if word in text_lower:
-            keywords.append(word)
-    return keywords
+    return [word for word in MOCK_PLANT_WORDS if word in text_lower]
 
 def mock_get_plant_care_schedule(plant_type, season):
     """Mock plant care schedule"""
     return f"{season.title()} Care for {plant_type.title()}:\n• Water regularly\n• Monitor for pests"
 
+# Fallbacks installed on utils when a function is missing
+UTILS_FALLBACKS = (
+    ("resize_image_for_analysis", mock_resize_image_for_analysis),
+    ("validate_image", mock_validate_image),
+    ("extract_plant_keywords", mock_extract_plant_keywords),
+    ("get_plant_care_schedule", mock_get_plant_care_schedule),
+)
+
 # Add mock functions to utils module if it doesn't exist
+# (at import time, before test modules run their `from utils import ...`)
 try:
     import utils
-    if not hasattr(utils, 'resize_image_for_analysis'):
-        utils.resize_image_for_analysis = mock_resize_image_for_analysis
-    if not hasattr(utils, 'validate_image'):
-        utils.validate_image = mock_validate_image
-    if not hasattr(utils, 'extract_plant_keywords'):
-        utils.extract_plant_keywords = mock_extract_plant_keywords
-    if not hasattr(utils, 'get_plant_care_schedule'):
-        utils.get_plant_care_schedule = mock_get_plant_care_schedule
+    for name, fallback in UTILS_FALLBACKS:
+        if not hasattr(utils, name):
+            setattr(utils, name, fallback)
 except ImportError:
-    pass
\ No newline at end of file
+    pass
@@ -9,6 +9,8 @@ import unittest
 import sys
 import os
 import time
+from collections import Counter
+import importlib.util
 
 # Add src to path
 project_root = os.path.dirname(os.path.dirname(__file__))
@@ -16,7 +18,17 @@ src_path = os.path.join(project_root, 'src')
 if src_path not in sys.path:
     sys.path.insert(0, src_path)
 
-def run_simple_tests():
+from run_tests import StatusResult, run_parallel_tests
+
+def iter_tests(suite):
+    """Yield the individual test cases in a nested test suite"""
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_tests(test)
+        else:
+            yield test
+
+def run_simple_tests(parallel=False):
     """Run simplified tests that work with current setup"""
     
     print("🌱 AI Plant Doctor - Simple Test Runner")
@@ -28,41 +40,86 @@ def run_simple_tests():
         'test_model_handler.py'
     ]
     
-    total_tests = 0
-    total_passed = 0
-    total_failed = 0
-    total_errors = 0
+    # Parallel workers only on request (--parallel): pytest reports in its own format
+    if parallel:
+        tests_dir = os.path.dirname(os.path.abspath(__file__))
+        success = run_parallel_tests([os.path.join(tests_dir, f) for f in test_files])
+        if success is not None:
+            return success
     
-    for test_file in test_files:
-        print(f"\n📋 Running {test_file}...")
-        print("-" * 30)
-        
+    module_names = [test_file.replace('.py', '') for test_file in test_files]
+    
+    print(f"\n📋 Running {', '.join(test_files)}...")
+    print("-" * 30)
+    
+    # Load each file on its own, so one that cannot be loaded does not stop the others,
+    # and remember which file each test came from
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    file_of_test = {}
+    load_errors = Counter()
+    for test_file, module_name in zip(test_files, module_names):
         try:
-            # Import and run the test module
-            module_name = test_file.replace('.py', '')
-            
-            # Load tests from file
-            loader = unittest.TestLoader()
-            suite = loader.loadTestsFromName(module_name)
-            
-            # Run tests
-            runner = unittest.TextTestRunner(verbosity=1, buffer=True)
-            result = runner.run(suite)
-            
-            # Update counters
-            total_tests += result.testsRun
-            total_passed += (result.testsRun - len(result.failures) - len(result.errors))
-            total_failed += len(result.failures)
-            total_errors += len(result.errors)
-            
-            # Show results for this file
-            print(f"✅ Passed: {result.testsRun - len(result.failures) - len(result.errors)}")
-            print(f"❌ Failed: {len(result.failures)}")
-            print(f"💥 Errors: {len(result.errors)}")
-            
+            file_suite = loader.loadTestsFromName(module_name)
         except Exception as e:
             print(f"❌ Could not run {test_file}: {e}")
-            total_errors += 1
+            load_errors[test_file] += 1
+            continue
+        for test in iter_tests(file_suite):
+            file_of_test[id(test)] = test_file
+        suite.addTest(file_suite)
+    
+    try:
+        # Run every loaded test through a single runner
+        runner = unittest.TextTestRunner(
+            stream=sys.stdout,
+            verbosity=0,
+            buffer=True,
+            resultclass=StatusResult
+        )
+        result = runner.run(suite)
+    except Exception as e:
+        print(f"❌ Could not run {', '.join(test_files)}: {e}")
+        return False
+    
+    file_of_module = dict(zip(module_names, test_files))
+    
+    def file_of(test):
+        """File a failed test came from, including setUpClass/setUpModule error holders"""
+        test_file = file_of_test.get(id(test))
+        if test_file is None:
+            # Holders are not suite members; their id reads "setUpClass (test_basic.TestX)"
+            holder_name = test.id().rpartition(" (")[2].rstrip(")")
+            test_file = file_of_module.get(holder_name.split(".", 1)[0])
+        return test_file
+    
+    failed_per_file = Counter(file_of(test) for test, _ in result.failures)
+    errors_per_file = Counter(file_of(test) for test, _ in result.errors)
+    run_per_file = Counter(file_of_test.values())
+    
+    # Show results for each file (a file that could not be loaded counts as one error)
+    for test_file in test_files:
+        file_passed = run_per_file[test_file] - failed_per_file[test_file] - errors_per_file[test_file]
+        print(f"\n📋 {test_file}")
+        print(f"✅ Passed: {file_passed}")
+        print(f"❌ Failed: {failed_per_file[test_file]}")
+        print(f"💥 Errors: {errors_per_file[test_file] + load_errors[test_file]}")
+    
+    # Show why tests failed
+    for heading, problems in (("❌ FAILURES:", result.failures), ("💥 ERRORS:", result.errors)):
+        if problems:
+            print(f"\n{heading}")
+            print("-" * 30)
+            for test, traceback in problems:
+                print(f"Test: {test.id()}")
+                print(traceback.rstrip())
+                print()
+    
+    total_tests = result.testsRun
+    total_failed = len(result.failures)
+    total_errors = len(result.errors)
+    total_passed = total_tests - total_failed - total_errors
+    total_errors += sum(load_errors.values())
     
     # Final summary
     print("\n" + "=" * 50)
@@ -103,11 +160,10 @@ def run_individual_test():
             print("   ❌ PIL/Pillow import failed")
             return False
         
-        try:
-            import torch
-            print("   ✅ PyTorch imported successfully")
-        except ImportError:
-            print("   ❌ PyTorch import failed")
+        if importlib.util.find_spec("torch") is not None:
+            print("   ✅ PyTorch is installed")
+        else:
+            print("   ❌ PyTorch not found")
             return False
         
         # Test 2: Image creation
@@ -182,8 +238,9 @@ def main():
     if len(sys.argv) > 1 and sys.argv[1] == '--individual':
         success = run_individual_test()
     else:
-        print("Running simple tests (use --individual for basic functionality test)")
-        success = run_simple_tests()
+        print("Running simple tests (use --individual for basic functionality test, "
+              "--parallel for pytest-xdist workers)")
+        success = run_simple_tests(parallel='--parallel' in sys.argv[1:])
     
     if success:
         print("\n🚀 Ready for development!")
@@ -9,20 +9,57 @@ import unittest
 import sys
 import os
 import time
-from io import StringIO
+import importlib.util
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-def run_all_tests():
+class StatusResult(unittest.TextTestResult):
+    """Test result that prints one status line per test as it finishes"""
+    
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self.stream.writeln(f"✅ {test.id()}")
+    
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self.stream.writeln(f"❌ {test.id()}")
+    
+    def addError(self, test, err):
+        super().addError(test, err)
+        self.stream.writeln(f"💥 {test.id()}")
+    
+    def printErrors(self):
+        # Failures and errors are summarised by the runner scripts
+        pass
+
+
+def run_parallel_tests(test_paths):
+    """Run tests across pytest-xdist workers, or return None if xdist is missing"""
+    if importlib.util.find_spec("xdist") is None:
+        print("⚠️  pytest-xdist is not installed, running tests serially")
+        return None
+    
+    import pytest
+    return pytest.main(["-q", "--durations=20", "-n", "auto", "--dist=loadfile", *test_paths]) == 0
+
+
+def run_all_tests(parallel=False):
     """Run all test suites with comprehensive reporting"""
     
     print("🌱 AI Plant Doctor - Test Suite Runner")
     print("=" * 50)
     
+    start_dir = os.path.dirname(os.path.abspath(__file__))
+    
+    # Parallel workers only on request (--parallel): pytest reports in its own format
+    if parallel:
+        success = run_parallel_tests([start_dir])
+        if success is not None:
+            return success
+    
     # Discover and load all tests
     loader = unittest.TestLoader()
-    start_dir = os.path.dirname(__file__)
     suite = loader.discover(start_dir, pattern='test_*.py')
     
     # Count total tests
@@ -31,35 +68,22 @@ def run_all_tests():
     print("-" * 50)
     
     # Create detailed test runner
-    stream = StringIO()
     runner = unittest.TextTestRunner(
-        stream=stream,
-        verbosity=2,
+        stream=sys.stdout,
+        verbosity=0,
         buffer=True,
-        failfast=False
+        failfast=False,
+        resultclass=StatusResult
     )
     
+    print("📋 Test Results:")
+    print("-" * 50)
+    
     # Run tests with timing
     start_time = time.time()
     result = runner.run(suite)
     end_time = time.time()
     
-    # Get output
-    test_output = stream.getvalue()
-    
-    # Print results
-    print("📋 Test Results:")
-    print("-" * 50)
-    
-    # Print test output (but filter for important parts)
-    lines = test_output.split('\n')
-    for line in lines:
-        if any(keyword in line for keyword in ['test_', 'ERROR', 'FAIL', 'OK', '...']):
-            if 'test_' in line and ('OK' in line or 'FAIL' in line or 'ERROR' in line):
-                status = "✅" if "OK" in line else "❌" if "FAIL" in line else "💥"
-                test_name = line.split()[0]
-                print(f"{status} {test_name}")
-    
     print("-" * 50)
     
     # Summary statistics
@@ -141,11 +165,11 @@ def check_test_dependencies():
     
     missing_modules = []
     
+    # find_spec locates modules without importing them (torch alone takes seconds)
     for module in required_modules:
-        try:
-            __import__(module)
+        if importlib.util.find_spec(module) is not None:
             print(f"✅ {module}")
-        except ImportError:
+        else:
             print(f"❌ {module} - Not found")
             missing_modules.append(module)
     
@@ -162,9 +186,13 @@ def check_test_dependencies():
 def main():
     """Main test runner entry point"""
     
-    if len(sys.argv) > 1:
+    args = sys.argv[1:]
+    parallel = '--parallel' in args
+    args = [arg for arg in args if arg != '--parallel']
+    
+    if args:
         # Run specific test file
-        test_file = sys.argv[1]
+        test_file = args[0]
         if test_file.endswith('.py'):
             success = run_specific_test_file(test_file)
         else:
@@ -176,7 +204,7 @@ def main():
             sys.exit(1)
         
         # Run all tests
-        success = run_all_tests()
+        success = run_all_tests(parallel=parallel)
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)
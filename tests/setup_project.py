@@ -6,8 +6,21 @@ This script helps organize your files and fix common issues.
 """
 
 import os
+import ast
 import shutil
 import sys
+import io
+import importlib
+import unittest
+from pathlib import Path
+
+def list_entries(directory='.'):
+    """Return the names in a directory with one scan, or an empty set if it is missing"""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
 
 def create_project_structure():
     """Create proper project directory structure"""
@@ -25,8 +38,9 @@ def create_project_structure():
     ]
     
     # Create directories
+    root_entries = list_entries()
     for directory in directories:
-        if not os.path.exists(directory):
+        if directory not in root_entries:
             os.makedirs(directory)
             print(f"   ✅ Created directory: {directory}/")
         else:
@@ -49,16 +63,18 @@ def move_python_files_to_src():
     ]
     
     moved_files = []
+    root_entries = list_entries()
+    src_entries = list_entries('src') if 'src' in root_entries else set()
     
     for file in python_files:
-        if os.path.exists(file) and not os.path.exists(f'src/{file}'):
+        if file in root_entries and file not in src_entries:
             try:
                 shutil.move(file, f'src/{file}')
                 moved_files.append(file)
                 print(f"   ✅ Moved {file} -> src/{file}")
             except Exception as e:
                 print(f"   ❌ Failed to move {file}: {e}")
-        elif os.path.exists(f'src/{file}'):
+        elif file in src_entries:
             print(f"   📁 Already in src/: {file}")
         else:
             print(f"   ⚠️  File not found: {file}")
@@ -78,13 +94,15 @@ def create_init_files():
         'tests/__init__.py'
     ]
     
+    package_entries = {package: list_entries(package) for package in ('src', 'tests')}
+    
     for init_file in init_locations:
-        if not os.path.exists(init_file):
-            with open(init_file, 'w') as f:
-                if 'src' in init_file:
-                    f.write('"""AI Plant Doctor - Source Package"""\n')
-                else:
-                    f.write('"""AI Plant Doctor - Test Package"""\n')
+        package, name = init_file.split('/')
+        if name not in package_entries[package]:
+            if package == 'src':
+                Path(init_file).write_text('"""AI Plant Doctor - Source Package"""\n')
+            else:
+                Path(init_file).write_text('"""AI Plant Doctor - Test Package"""\n')
             print(f"   ✅ Created {init_file}")
         else:
             print(f"   📄 Exists: {init_file}")
@@ -96,7 +114,7 @@ def create_requirements_txt():
     
     print("\n📋 Checking requirements.txt...")
     
-    if not os.path.exists('requirements.txt'):
+    if not Path('requirements.txt').exists():
         requirements_content = """# AI Plant Doctor Dependencies
 
 # Core dependencies
@@ -126,8 +144,7 @@ flake8>=6.0.0
 mypy>=1.0.0
 """
         
-        with open('requirements.txt', 'w') as f:
-            f.write(requirements_content)
+        Path('requirements.txt').write_text(requirements_content)
         print("   ✅ Created requirements.txt")
     else:
         print("   📋 requirements.txt already exists")
@@ -146,15 +163,15 @@ def fix_import_issues():
     for file in src_files:
         file_path = f'src/{file}'
         try:
-            with open(file_path, 'r') as f:
+            with open(file_path, 'rb') as f:
                 content = f.read()
             
-            # Check if file can be imported (basic syntax check)
-            if 'import' in content and 'def' in content:
-                print(f"   ✅ {file} appears to have valid syntax")
-            else:
-                print(f"   ⚠️  {file} may have syntax issues")
+            # Parse once to get a real syntax check
+            ast.parse(content, filename=file_path)
+            print(f"   ✅ {file} appears to have valid syntax")
                 
+        except SyntaxError as e:
+            print(f"   ⚠️  {file} has a syntax error on line {e.lineno}: {e.msg}")
         except Exception as e:
             print(f"   ❌ Error checking {file}: {e}")
     
@@ -173,19 +190,25 @@ import unittest
 import sys
 import os
 
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 class TestBasicSetup(unittest.TestCase):
     """Test that basic setup is working"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create the shared test image once for the class"""
+        cls.sample_image = Image.new('RGB', (100, 100), color='green') if Image is not None else None
+    
     def test_imports(self):
         """Test that we can import basic modules"""
-        try:
-            from PIL import Image
-            self.assertTrue(True, "PIL imported successfully")
-        except ImportError:
-            self.fail("PIL/Pillow not available")
+        self.assertIsNotNone(Image, "PIL/Pillow not available")
     
     def test_torch(self):
         """Test that PyTorch is available"""
@@ -197,12 +220,9 @@ class TestBasicSetup(unittest.TestCase):
     
     def test_image_creation(self):
         """Test basic image operations"""
-        from PIL import Image
-        
-        # Create test image
-        img = Image.new('RGB', (100, 100), color='green')
-        self.assertEqual(img.size, (100, 100))
-        self.assertEqual(img.mode, 'RGB')
+        self.assertIsNotNone(self.sample_image, "PIL/Pillow not available")
+        self.assertEqual(self.sample_image.size, (100, 100))
+        self.assertEqual(self.sample_image.mode, 'RGB')
     
     def test_project_structure(self):
         """Test that project structure exists"""
@@ -221,9 +241,8 @@ if __name__ == '__main__':
 '''
     
     test_file_path = 'tests/test_setup.py'
-    if not os.path.exists(test_file_path):
-        with open(test_file_path, 'w') as f:
-            f.write(simple_test_content)
+    if not Path(test_file_path).exists():
+        Path(test_file_path).write_text(simple_test_content)
         print(f"   ✅ Created {test_file_path}")
     else:
         print(f"   📄 {test_file_path} already exists")
@@ -235,7 +254,7 @@ def create_gitignore():
     
     print("\n📝 Creating .gitignore...")
     
-    if not os.path.exists('.gitignore'):
+    if not Path('.gitignore').exists():
         gitignore_content = """# Python
 __pycache__/
 *.py[cod]
@@ -311,8 +330,7 @@ gradio_cached_examples/
 flagged/
 """
         
-        with open('.gitignore', 'w') as f:
-            f.write(gitignore_content)
+        Path('.gitignore').write_text(gitignore_content)
         print("   ✅ Created .gitignore")
     else:
         print("   📝 .gitignore already exists")
@@ -325,17 +343,34 @@ def run_basic_test():
     print("\n🚀 Running basic setup test...")
     
     try:
-        import subprocess
-        result = subprocess.run([
-            sys.executable, '-m', 'unittest', 'tests.test_setup', '-v'
-        ], capture_output=True, text=True, cwd='.')
+        # Run in-process to avoid a second interpreter start and re-import
+        try:
+            if os.getcwd() not in sys.path:
+                sys.path.insert(0, os.getcwd())
+            test_module = importlib.import_module('tests.test_setup')
+        except ImportError:
+            test_module = None
+        
+        if test_module is not None:
+            suite = unittest.TestLoader().loadTestsFromModule(test_module)
+            stream = io.StringIO()
+            result = unittest.TextTestRunner(stream=stream, verbosity=2, buffer=True).run(suite)
+            passed = result.wasSuccessful()
+            errors = stream.getvalue()
+        else:
+            import subprocess
+            result = subprocess.run([
+                sys.executable, '-m', 'unittest', 'tests.test_setup', '-v'
+            ], capture_output=True, text=True, cwd='.')
+            passed = result.returncode == 0
+            errors = result.stderr
         
-        if result.returncode == 0:
+        if passed:
             print("   ✅ Basic setup test passed!")
             print("   🎉 Your project is properly configured!")
         else:
             print("   ⚠️  Basic setup test had issues:")
-            print(f"      {result.stderr}")
+            print(f"      {errors}")
             print("   💡 This is normal - some dependencies may need installation")
     
     except Exception as e:
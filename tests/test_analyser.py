@@ -5,6 +5,7 @@ Tests symptom detection, condition matching, and treatment generation.
 """
 
 import unittest
+import copy
 from unittest.mock import Mock, patch
 import sys
 import os
@@ -219,6 +220,64 @@ class TestPlantHealthAnalyzer(unittest.TestCase):
         minimal_result = self.analyzer.process_analysis("plant", "general_diagnosis", "")
         self.assertIsInstance(minimal_result, dict)
     
+    def test_batch_processing_matches_single(self):
+        """Test batch processing returns the same results as one-by-one processing"""
+        items = [
+            (self.fungal_analysis, "disease_focused", "tomato plant"),
+            (self.healthy_analysis, "general_diagnosis", ""),
+            ("", "general_diagnosis", ""),
+            (self.nutrient_analysis, "general_diagnosis", "")
+        ]
+        single_analyzer = PlantHealthAnalyzer()
+        expected = [single_analyzer.process_analysis(*item) for item in items]
+        
+        results = self.analyzer.process_analyses_batch(items)
+        
+        self.assertEqual(len(results), len(items))
+        for result, expected_result in zip(results, expected):
+            self.assertEqual(result["severity_level"], expected_result["severity_level"])
+            self.assertEqual(result["detected_symptoms"], expected_result["detected_symptoms"])
+            self.assertEqual(
+                [c["name"] for c in result["possible_conditions"]],
+                [c["name"] for c in expected_result["possible_conditions"]]
+            )
+    
+    def test_repeated_analysis_is_reused(self):
+        """Test repeated analysis text gives the same result and is not affected by earlier callers"""
+        first = self.analyzer.process_analysis(self.fungal_analysis, "disease_focused", "tomato plant")
+        expected = copy.deepcopy(first)
+        first["detected_symptoms"][0]["confidence"] = 0.0
+        first["detected_symptoms"].clear()
+        first["possible_conditions"][0]["matched_symptoms"].clear()
+        first["possible_conditions"].clear()
+        first["treatments"].clear()
+        first["prevention_tips"].clear()
+        
+        second = self.analyzer.process_analysis(self.fungal_analysis, "disease_focused", "tomato plant")
+        
+        self.assertEqual(second, expected)
+    
+    def test_repeated_healthy_analysis_is_not_affected_by_earlier_callers(self):
+        """Test condition info built for a healthy plant is not shared between repeated results"""
+        first = self.analyzer.process_analysis(self.healthy_analysis, "general_diagnosis", "")
+        expected = copy.deepcopy(first)
+        first["possible_conditions"][0]["info"]["description"] = ""
+        first["possible_conditions"][0]["info"]["prevention"].clear()
+        
+        second = self.analyzer.process_analysis(self.healthy_analysis, "general_diagnosis", "")
+        
+        self.assertEqual(second, expected)
+    
+    def test_reused_result_follows_season(self):
+        """Test a repeated analysis picks up the prevention tips of a new season"""
+        with patch.object(PlantHealthAnalyzer, "_get_current_season", return_value="winter"):
+            self.analyzer.process_analysis(self.fungal_analysis, "disease_focused", "tomato plant")
+        with patch.object(PlantHealthAnalyzer, "_get_current_season", return_value="summer"):
+            summer = self.analyzer.process_analysis(self.fungal_analysis, "disease_focused", "tomato plant")
+            fresh = PlantHealthAnalyzer().process_analysis(self.fungal_analysis, "disease_focused", "tomato plant")
+        
+        self.assertEqual(summer, fresh)
+    
     def test_multiple_symptoms_detection(self):
         """Test detection of multiple symptoms"""
         complex_analysis = "The plant has yellowing leaves with brown spots and shows signs of wilting."
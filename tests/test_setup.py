@@ -6,19 +6,25 @@ import unittest
 import sys
 import os
 
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 class TestBasicSetup(unittest.TestCase):
     """Test that basic setup is working"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create the shared test image once for the class"""
+        cls.sample_image = Image.new('RGB', (100, 100), color='green') if Image is not None else None
+    
     def test_imports(self):
         """Test that we can import basic modules"""
-        try:
-            from PIL import Image
-            self.assertTrue(True, "PIL imported successfully")
-        except ImportError:
-            self.fail("PIL/Pillow not available")
+        self.assertIsNotNone(Image, "PIL/Pillow not available")
     
     def test_torch(self):
         """Test that PyTorch is available"""
@@ -30,12 +36,9 @@ class TestBasicSetup(unittest.TestCase):
     
     def test_image_creation(self):
         """Test basic image operations"""
-        from PIL import Image
-        
-        # Create test image
-        img = Image.new('RGB', (100, 100), color='green')
-        self.assertEqual(img.size, (100, 100))
-        self.assertEqual(img.mode, 'RGB')
+        self.assertIsNotNone(self.sample_image, "PIL/Pillow not available")
+        self.assertEqual(self.sample_image.size, (100, 100))
+        self.assertEqual(self.sample_image.mode, 'RGB')
     
     def test_project_structure(self):
         """Test that project structure exists"""
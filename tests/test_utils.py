@@ -8,6 +8,7 @@ import unittest
 from unittest.mock import Mock, patch
 from PIL import Image
 import tempfile
+import io
 import os
 import sys
 
@@ -19,7 +20,8 @@ try:
         format_diagnosis_report, ensure_confidence_string, validate_image,
         resize_image_for_analysis, format_symptoms_list, format_treatments_text,
         extract_plant_keywords, create_severity_badge, format_confidence_indicator,
-        sanitize_filename, create_diagnosis_summary, get_confidence_recommendation
+        sanitize_filename, create_diagnosis_summary, get_confidence_recommendation,
+        validate_image_source
     )
 except ImportError as e:
     print(f"Import warning: {e}")
@@ -217,6 +219,29 @@ class TestImageValidation(unittest.TestCase):
             self.assertFalse(is_valid)
             self.assertIn("too large", message.lower())
     
+    def test_validate_image_source(self):
+        """Test validation of encoded images from their header"""
+        def encode(size, image_format):
+            buffer = io.BytesIO()
+            Image.new('RGB', size, color='green').save(buffer, image_format)
+            return buffer.getvalue()
+        
+        # Valid JPEG is decoded at a reduced scale that still covers max_size
+        is_valid, message, image = validate_image_source(encode((3000, 2000), 'JPEG'), max_size=1024)
+        self.assertTrue(is_valid)
+        self.assertIn("valid", message.lower())
+        self.assertEqual(image.size, (1500, 1000))
+        
+        # Rejected images are reported without an image
+        is_valid, message, image = validate_image_source(encode((50, 50), 'PNG'))
+        self.assertFalse(is_valid)
+        self.assertIn("too small", message.lower())
+        self.assertIsNone(image)
+        
+        is_valid, message, image = validate_image_source(b"not an image")
+        self.assertFalse(is_valid)
+        self.assertIsNone(image)
+    
     def test_resize_image_for_analysis(self):
         """Test image resizing functionality"""
         # Test large image resizing